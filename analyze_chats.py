@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import os, glob, json, time, math, textwrap, argparse, collections, re
+import os, glob, json, time, math, textwrap, argparse, collections, re, csv
 import pandas as pd
+import zstandard as zstd
 # matplotlib removed - no charts needed
 from datetime import datetime, timedelta
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
@@ -22,23 +24,28 @@ REQUESTS_PER_MINUTE = 500     # rate limiting (increased for much faster process
 MAX_WORKERS = 10              # number of parallel API workers
 
 # --------------- WEEK DETECTION ---------------
+# cells pandas' read_csv would have read as NaN (its default na_values), which never count as a timestamp or a message
+MISSING_CELL_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
 def get_conversation_week(csv_path):
     """Extract the week from a conversation CSV file based on the first timestamp."""
     try:
-        df = pd.read_csv(csv_path)
-        
-        # Try to find time column
-        col_time = next((c for c in df.columns if "Time" in c), None)
-        if not col_time:
-            return None
-        
-        # Get the first timestamp
-        first_time = None
-        for _, row in df.iterrows():
-            time_str = str(row[col_time]).strip()
-            if time_str and time_str != 'nan' and time_str != 'None':
-                first_time = time_str
-                break
+        # Stream rows with csv.reader and stop at the first timestamp instead of parsing the whole file
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            col_time = next((c for c in header if "Time" in c), None)
+            if not col_time:
+                return None
+            i_time = header.index(col_time)
+
+            first_time = next((
+                row[i_time].strip() for row in reader
+                if len(row) > i_time and row[i_time].strip() not in MISSING_CELL_VALUES
+            ), None)
         
         if not first_time:
             return None
@@ -158,6 +165,8 @@ class RateLimiter:
 
 # --------------- LLM CLIENT ---------------
 import requests
+SESSION = requests.Session()  # shared across workers so connections are kept alive
+
 def chat_complete(system, user, rate_limiter):
     rate_limiter.wait_if_needed()
     
@@ -175,10 +184,30 @@ def chat_complete(system, user, rate_limiter):
         "temperature": 0.2,
         "response_format": {"type": "json_object"},
         "max_tokens": 1000,
+        "stream": True,
     }
-    r = requests.post(url, headers=headers, json=body, timeout=120)
-    r.raise_for_status()
-    return r.json()["choices"][0]["message"]["content"]
+    # Stream the completion and assemble the content deltas as they arrive. The stream is read through
+    # [DONE] rather than cut at the JSON object's closing brace: the server ends it right after that brace
+    # anyway, and abandoning a response mid-stream makes the pool drop the keep-alive connection.
+    parts = []
+    with SESSION.post(url, headers=headers, json=body, timeout=120, stream=True) as r:
+        r.raise_for_status()
+        # Endpoints that ignore "stream" answer with a plain chat completion body
+        if 'text/event-stream' not in r.headers.get('Content-Type', ''):
+            return r.json()["choices"][0]["message"]["content"]
+        for line in r.iter_lines():
+            # SSE allows "data:" with or without one space before the value
+            if not line.startswith(b"data:"):
+                continue
+            payload = line[5:]
+            if payload.startswith(b" "):
+                payload = payload[1:]
+            if payload == b"[DONE]":
+                break
+            choices = json.loads(payload).get("choices") or []
+            if choices:
+                parts.append(choices[0].get("delta", {}).get("content") or "")
+    return "".join(parts)
 
 # --------------- PROMPT ---------------
 SYSTEM_PROMPT = """You are an analyst that classifies chatbot conversations.
@@ -461,10 +490,13 @@ def process_single_file(args):
 # --------------- UTIL: DETECT INCOMPLETE CONVERSATIONS ---------------
 def is_incomplete_conversation(transcript):
     """Detect if a conversation is incomplete (no user input)."""
-    lines = transcript.split('\n')
-    user_lines = [line for line in lines if 'user:' in line.lower() and line.strip()]
-    # If no user lines or only empty user lines, it's incomplete
-    return len(user_lines) == 0
+    # If no user lines or only empty user lines, it's incomplete; stop at the first user line instead of collecting them all
+    return not any('user:' in line.lower() and line.strip() for line in transcript.split('\n'))
+
+# User replies that carry no request on their own (exact matches) and greeting words (substring matches)
+DISMISSAL_REPLIES = frozenset({'cancel', 'no', 'stop', 'quit', 'exit'})
+GREETING_WORDS = ('hi', 'hello', 'hey', 'good morning', 'good afternoon')
+GREETING_RE = re.compile('|'.join(map(re.escape, GREETING_WORDS)))
 
 def is_low_value_conversation(transcript):
     """Check if conversation has low analytical value based on user message count and content."""
@@ -472,10 +504,11 @@ def is_low_value_conversation(transcript):
     user_messages = []
     
     for line in lines:
-        line = line.strip()
-        if line and 'user:' in line.lower():
+        # Lower each line once; the sender prefix is already lower-case, so the split lands in the same place
+        line = line.strip().lower()
+        if line and 'user:' in line:
             # Extract just the message part after "user:"
-            msg_part = line.split('user:', 1)[1].strip().lower()
+            msg_part = line.split('user:', 1)[1].strip()
             user_messages.append(msg_part)
     
     # HARD THRESHOLD: If user has 2 or fewer messages, filter out
@@ -486,7 +519,7 @@ def is_low_value_conversation(transcript):
     meaningful_content = False
     for msg in user_messages:
         # Skip if it's just "cancel", "no", "stop"
-        if msg in ['cancel', 'no', 'stop', 'quit', 'exit']:
+        if msg in DISMISSAL_REPLIES:
             continue
         
         # Skip if it's just a form submission without context
@@ -494,7 +527,7 @@ def is_low_value_conversation(transcript):
             continue
         
         # Skip if it's just a greeting
-        if len(msg) < 20 and any(word in msg for word in ['hi', 'hello', 'hey', 'good morning', 'good afternoon']):
+        if len(msg) < 20 and GREETING_RE.search(msg):
             continue
         
         # If we get here, there's meaningful content
@@ -504,48 +537,144 @@ def is_low_value_conversation(transcript):
     return not meaningful_content
 
 # --------------- UTIL: BUILD TRANSCRIPTS ---------------
-def csv_to_transcript(csv_path):
-    df = pd.read_csv(csv_path)
-    # Try to accommodate column naming differences gracefully
-    col_time = next((c for c in df.columns if "Time" in c), None)
-    col_sender = next((c for c in df.columns if c.lower().startswith("sender type")), None)
-    col_msg = next((c for c in df.columns if c.lower() == "message"), None)
+def find_transcript_columns(columns):
+    """Locate the time, sender and message columns, accommodating naming differences gracefully."""
+    col_time = next((c for c in columns if "Time" in c), None)
+    col_sender = next((c for c in columns if c.lower().startswith("sender type")), None)
+    col_msg = next((c for c in columns if c.lower() == "message"), None)
+    return col_time, col_sender, col_msg
 
-    if col_time is None or col_sender is None or col_msg is None:
-        # fallback: just join any text-looking columns
-        text_cols = [c for c in df.columns if df[c].dtype == object]
-        transcript = "\n".join(
-            " | ".join(str(x) for x in row[text_cols].tolist())
-            for _, row in df.iterrows()
-        )
-        if MAX_TRANSCRIPT_CHARS:
-            return transcript[:MAX_TRANSCRIPT_CHARS]
-        return transcript
+SENDER_ALIASES = {
+    "web": "user", "user": "user", "customer": "user", "client": "user",
+    "bot": "bot", "assistant": "bot", "agent": "bot", "system": "bot",
+}
+TIMESTAMP_FRACTION_RE = re.compile(r"\.\d+$")
 
-    def normalize_sender(v):
-        v = str(v).strip().lower()
-        if v in ("web","user","customer","client"): return "user"
-        if v in ("bot","assistant","agent","system"): return "bot"
-        return v or "user"
+def normalize_sender(v):
+    v = str(v).strip().lower()
+    return SENDER_ALIASES.get(v, v or "user")
 
-    lines = []
-    for _, row in df.iterrows():
-        t = str(row[col_time]) if col_time in row else ""
-        spk = normalize_sender(row[col_sender])
-        msg = str(row[col_msg]) if col_msg in row and not (pd.isna(row[col_msg])) else ""
-        if not msg: 
-            continue
-        # compact timestamp
-        t = re.sub(r"\.\d+$","",t)
-        lines.append(f"[{t}] {spk}: {msg}")
+def csv_to_transcript(csv_path):
+    # Fast path: well-formed exports only need three columns, so read them with csv.reader instead of pandas
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        col_time, col_sender, col_msg = find_transcript_columns(header)
 
-    transcript = "\n".join(lines)
-    
+        if col_time is not None and col_sender is not None and col_msg is not None:
+            i_time, i_sender, i_msg = header.index(col_time), header.index(col_sender), header.index(col_msg)
+            last = max(i_time, i_sender, i_msg)
+            # one comprehension + join; timestamps are compacted by dropping fractional seconds, and
+            # messages pandas would have read as NaN ("N/A", "null", ...) are skipped as empty
+            transcript = "\n".join([
+                f"[{TIMESTAMP_FRACTION_RE.sub('', row[i_time])}] {normalize_sender(row[i_sender])}: {row[i_msg]}"
+                for row in reader
+                if len(row) > last and row[i_msg] not in MISSING_CELL_VALUES
+            ])
+            if MAX_TRANSCRIPT_CHARS:
+                return transcript[:MAX_TRANSCRIPT_CHARS]
+            return transcript
+
+    # fallback: unknown layout, just join any text-looking columns
+    df = pd.read_csv(csv_path)
+    text_cols = [c for c in df.columns if df[c].dtype == object]
+    transcript = "\n".join(
+        " | ".join(str(x) for x in row[text_cols].tolist())
+        for _, row in df.iterrows()
+    )
     if MAX_TRANSCRIPT_CHARS:
         return transcript[:MAX_TRANSCRIPT_CHARS]
     return transcript
 
+# --------------- UTIL: PROBLEM EXTRACTION ---------------
+# LLM labels meaning "nothing to fix"; matched as substrings of the lowercased label
+SUCCESS_IMPROVEMENT_PHRASES = (
+    'bot-handled-perfectly', 'user-request-fulfilled', 'conversation-successful',
+    'bot-solved-problem', 'user-satisfied', 'conversation-completed-successfully'
+)
+NO_ESCALATION_PHRASES = (
+    'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
+    'conversation-completed-successfully', 'user-abandoned-conversation'
+)
+NO_ERROR_PHRASES = (
+    'none', 'no-errors-detected', 'system-functioning-perfectly',
+    'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
+)
+# One alternation per list, so each label is scanned once instead of once per phrase
+SUCCESS_IMPROVEMENT_RE = re.compile('|'.join(map(re.escape, SUCCESS_IMPROVEMENT_PHRASES)))
+NO_ESCALATION_RE = re.compile('|'.join(map(re.escape, NO_ESCALATION_PHRASES)))
+NO_ERROR_RE = re.compile('|'.join(map(re.escape, NO_ERROR_PHRASES)))
+
+def iter_problems(r):
+    """Yield the problems one analyzed conversation reports: missing feature, improvement, escalation triggers and errors."""
+    # Check for missing features
+    if r.get("failure_category") == "feature-not-supported":
+        missing_feature = r.get("missing_feature", "unknown-feature")
+        if missing_feature and missing_feature != "unknown-feature":
+            yield missing_feature
+    
+    # Check for improvement needs, filtering out success indicators - these are not problems
+    improvement = r.get("specific_improvement_needed", "no-improvement-needed")
+    if improvement and improvement != "no-improvement-needed":
+        if not SUCCESS_IMPROVEMENT_RE.search(improvement.lower()):
+            yield improvement
+    
+    # Check for escalation triggers
+    for trigger in r.get("escalation_triggers", []):
+        if trigger and not NO_ESCALATION_RE.search(trigger.lower()):
+            yield trigger
+    
+    # Check for error patterns
+    for error in r.get("error_patterns", []):
+        if error and not NO_ERROR_RE.search(error.lower()):
+            yield error
+
 # --------------- MAIN ---------------
+# Problem categories and their keywords; a problem goes to the category with the most keyword hits
+PROBLEM_CATEGORY_KEYWORDS = {
+    'Technical Issues': [
+        'error', 'bug', 'crash', 'fail', 'broken', 'not working', 'malfunction',
+        'technical', 'system', 'backend', 'api', 'integration', 'connection'
+    ],
+    'User Experience': [
+        'ui', 'ux', 'interface', 'design', 'layout', 'navigation', 'usability',
+        'user experience', 'user interface', 'user interface design'
+    ],
+    'Feature Gaps': [
+        'missing', 'not available', 'lack of', 'need', 'require', 'want',
+        'feature', 'functionality', 'capability', 'tool', 'option'
+    ],
+    'Human Support': [
+        'human', 'agent', 'support', 'escalation', 'live', 'real-time',
+        'manual', 'intervention', 'assistance', 'help'
+    ],
+    'Performance': [
+        'slow', 'performance', 'speed', 'delay', 'timeout', 'lag',
+        'response time', 'loading', 'processing'
+    ],
+    'Account & Access': [
+        'account', 'login', 'access', 'permission', 'verification',
+        'authentication', 'authorization', 'credentials'
+    ],
+    'Billing & Payment': [
+        'billing', 'payment', 'invoice', 'charge', 'cost', 'price',
+        'subscription', 'plan', 'fee'
+    ],
+    'Campaign Management': [
+        'campaign', 'ad', 'advertising', 'marketing', 'promotion',
+        'targeting', 'audience', 'reach'
+    ],
+    'Data & Analytics': [
+        'data', 'analytics', 'report', 'statistics', 'metrics',
+        'tracking', 'measurement', 'insights'
+    ],
+    'Content & Media': [
+        'content', 'media', 'file', 'upload', 'download', 'image',
+        'video', 'document', 'asset'
+    ]
+}
+PROBLEM_CATEGORY_NAMES = list(PROBLEM_CATEGORY_KEYWORDS)
+
 def create_intelligent_problem_groups(problems):
     """
     Create intelligent problem grouping and summarization based on problem descriptions.
@@ -553,65 +682,14 @@ def create_intelligent_problem_groups(problems):
     """
     grouped_problems = {}
     
-    # Define problem categories and their keywords
-    problem_categories = {
-        'Technical Issues': [
-            'error', 'bug', 'crash', 'fail', 'broken', 'not working', 'malfunction',
-            'technical', 'system', 'backend', 'api', 'integration', 'connection'
-        ],
-        'User Experience': [
-            'ui', 'ux', 'interface', 'design', 'layout', 'navigation', 'usability',
-            'user experience', 'user interface', 'user interface design'
-        ],
-        'Feature Gaps': [
-            'missing', 'not available', 'lack of', 'need', 'require', 'want',
-            'feature', 'functionality', 'capability', 'tool', 'option'
-        ],
-        'Human Support': [
-            'human', 'agent', 'support', 'escalation', 'live', 'real-time',
-            'manual', 'intervention', 'assistance', 'help'
-        ],
-        'Performance': [
-            'slow', 'performance', 'speed', 'delay', 'timeout', 'lag',
-            'response time', 'loading', 'processing'
-        ],
-        'Account & Access': [
-            'account', 'login', 'access', 'permission', 'verification',
-            'authentication', 'authorization', 'credentials'
-        ],
-        'Billing & Payment': [
-            'billing', 'payment', 'invoice', 'charge', 'cost', 'price',
-            'subscription', 'plan', 'fee'
-        ],
-        'Campaign Management': [
-            'campaign', 'ad', 'advertising', 'marketing', 'promotion',
-            'targeting', 'audience', 'reach'
-        ],
-        'Data & Analytics': [
-            'data', 'analytics', 'report', 'statistics', 'metrics',
-            'tracking', 'measurement', 'insights'
-        ],
-        'Content & Media': [
-            'content', 'media', 'file', 'upload', 'download', 'image',
-            'video', 'document', 'asset'
-        ]
-    }
-    
     # Group problems by category
     for problem, conversations in problems.items():
-        assigned_category = 'Other'
-        highest_score = 0
+        problem_lower = problem.lower()
         
-        # Find the best matching category
-        for category, keywords in problem_categories.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in problem.lower():
-                    score += 1
-            
-            if score > highest_score:
-                highest_score = score
-                assigned_category = category
+        # Find the best matching category (first one wins on ties)
+        scores = [sum(map(problem_lower.__contains__, keywords)) for keywords in PROBLEM_CATEGORY_KEYWORDS.values()]
+        highest_score = max(scores, default=0)
+        assigned_category = PROBLEM_CATEGORY_NAMES[scores.index(highest_score)] if highest_score > 0 else 'Other'
         
         # Create category if it doesn't exist
         if assigned_category not in grouped_problems:
@@ -633,57 +711,40 @@ def create_intelligent_problem_groups(problems):
     
     return grouped_problems
 
+# Per-category summary template plus the (theme, note) pairs appended when a theme shows up in the problems
+CATEGORY_SUMMARIES = {
+    'Technical Issues': ("System and technical problems affecting {} conversations",
+                         (('api', ' (API integration issues)'), ('error', ' (Error handling)'))),
+    'User Experience': ("Interface and usability issues in {} conversations",
+                        (('navigation', ' (Navigation problems)'), ('design', ' (Design issues)'))),
+    'Feature Gaps': ("Missing functionality requested in {} conversations",
+                     (('automation', ' (Automation needs)'), ('workflow', ' (Workflow improvements)'))),
+    'Human Support': ("Escalation to human support in {} conversations",
+                      (('live', ' (Live chat requests)'), ('complex', ' (Complex issues)'))),
+    'Performance': ("Performance and speed issues in {} conversations",
+                    (('slow', ' (Slow response times)'), ('timeout', ' (Timeout issues)'))),
+    'Account & Access': ("Account and access problems in {} conversations",
+                         (('verification', ' (Verification issues)'), ('permission', ' (Permission problems)'))),
+    'Billing & Payment': ("Billing and payment issues in {} conversations",
+                          (('invoice', ' (Invoice requests)'), ('payment', ' (Payment problems)'))),
+    'Campaign Management': ("Campaign and advertising issues in {} conversations",
+                            (('targeting', ' (Targeting problems)'), ('approval', ' (Approval issues)'))),
+    'Data & Analytics': ("Data and analytics problems in {} conversations",
+                         (('tracking', ' (Tracking issues)'), ('report', ' (Reporting problems)'))),
+    'Content & Media': ("Content and media issues in {} conversations",
+                        (('upload', ' (Upload problems)'), ('media', ' (Media handling)'))),
+}
+OTHER_CATEGORY_SUMMARY = ("Other issues affecting {} conversations", ())
+
 def generate_category_summary(category, problems, total_conversations):
     """Generate intelligent category summaries based on problems and themes."""
-    # Extract key themes from problems
-    themes = extract_problem_themes(problems)
-    
-    # Generate summary based on category and themes
-    summary = ''
-    
-    if category == 'Technical Issues':
-        summary = f"System and technical problems affecting {total_conversations} conversations"
-        if 'api' in themes: summary += ' (API integration issues)'
-        if 'error' in themes: summary += ' (Error handling)'
-    elif category == 'User Experience':
-        summary = f"Interface and usability issues in {total_conversations} conversations"
-        if 'navigation' in themes: summary += ' (Navigation problems)'
-        if 'design' in themes: summary += ' (Design issues)'
-    elif category == 'Feature Gaps':
-        summary = f"Missing functionality requested in {total_conversations} conversations"
-        if 'automation' in themes: summary += ' (Automation needs)'
-        if 'workflow' in themes: summary += ' (Workflow improvements)'
-    elif category == 'Human Support':
-        summary = f"Escalation to human support in {total_conversations} conversations"
-        if 'live' in themes: summary += ' (Live chat requests)'
-        if 'complex' in themes: summary += ' (Complex issues)'
-    elif category == 'Performance':
-        summary = f"Performance and speed issues in {total_conversations} conversations"
-        if 'slow' in themes: summary += ' (Slow response times)'
-        if 'timeout' in themes: summary += ' (Timeout issues)'
-    elif category == 'Account & Access':
-        summary = f"Account and access problems in {total_conversations} conversations"
-        if 'verification' in themes: summary += ' (Verification issues)'
-        if 'permission' in themes: summary += ' (Permission problems)'
-    elif category == 'Billing & Payment':
-        summary = f"Billing and payment issues in {total_conversations} conversations"
-        if 'invoice' in themes: summary += ' (Invoice requests)'
-        if 'payment' in themes: summary += ' (Payment problems)'
-    elif category == 'Campaign Management':
-        summary = f"Campaign and advertising issues in {total_conversations} conversations"
-        if 'targeting' in themes: summary += ' (Targeting problems)'
-        if 'approval' in themes: summary += ' (Approval issues)'
-    elif category == 'Data & Analytics':
-        summary = f"Data and analytics problems in {total_conversations} conversations"
-        if 'tracking' in themes: summary += ' (Tracking issues)'
-        if 'report' in themes: summary += ' (Reporting problems)'
-    elif category == 'Content & Media':
-        summary = f"Content and media issues in {total_conversations} conversations"
-        if 'upload' in themes: summary += ' (Upload problems)'
-        if 'media' in themes: summary += ' (Media handling)'
-    else:
-        summary = f"Other issues affecting {total_conversations} conversations"
-    
+    # One table lookup instead of a branch per category
+    template, theme_notes = CATEGORY_SUMMARIES.get(category, OTHER_CATEGORY_SUMMARY)
+    summary = template.format(total_conversations)
+    if theme_notes:
+        # Extract key themes from problems
+        themes = extract_problem_themes(problems)
+        summary += "".join(note for theme, note in theme_notes if theme in themes)
     return summary
 
 def extract_problem_themes(problems):
@@ -705,7 +766,8 @@ def extract_problem_themes(problems):
     return themes
 
 def main(input_glob, outdir, sample_limit=None, dry_run=False):
-    os.makedirs(outdir, exist_ok=True)
+    out = Path(outdir)
+    out.mkdir(parents=True, exist_ok=True)
     csv_files = sorted(glob.glob(input_glob))
     if sample_limit:
         csv_files = csv_files[:sample_limit]
@@ -761,6 +823,7 @@ def main(input_glob, outdir, sample_limit=None, dry_run=False):
     
     # Process each week separately
     all_per_chat = []
+    all_problems = {}  # problem -> conversations across all weeks, filled alongside each week's mapping
     weekly_results = {}
     total_errs = 0
     
@@ -859,49 +922,16 @@ def main(input_glob, outdir, sample_limit=None, dry_run=False):
         
         print(f"  🎉 Week processing complete!")
         
-        # Create weekly problem mapping for this week
+        # Create weekly problem mapping for this week (and add the same problems to the overall mapping in this pass)
         weekly_problems = {}
         for r in per_chat:
-            problems_found = []
-            
-            # Check for missing features
-            if r.get("failure_category") == "feature-not-supported":
-                missing_feature = r.get("missing_feature", "unknown-feature")
-                if missing_feature and missing_feature != "unknown-feature":
-                    problems_found.append(missing_feature)
-            
-            # Check for improvement needs
-            improvement = r.get("specific_improvement_needed", "no-improvement-needed")
-            if improvement and improvement != "no-improvement-needed":
-                if not any(phrase in improvement.lower() for phrase in [
-                    'bot-handled-perfectly', 'user-request-fulfilled', 'conversation-successful',
-                    'bot-solved-problem', 'user-satisfied', 'conversation-completed-successfully'
-                ]):
-                    problems_found.append(improvement)
-            
-            # Check for escalation triggers
-            escalation_triggers = r.get("escalation_triggers", [])
-            for trigger in escalation_triggers:
-                if trigger and not any(phrase in trigger.lower() for phrase in [
-                    'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
-                    'conversation-completed-successfully', 'user-abandoned-conversation'
-                ]):
-                    problems_found.append(trigger)
-            
-            # Check for error patterns
-            error_patterns = r.get("error_patterns", [])
-            for error in error_patterns:
-                if error and not any(phrase in error.lower() for phrase in [
-                    'none', 'no-errors-detected', 'system-functioning-perfectly',
-                    'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
-                ]):
-                    problems_found.append(error)
-            
-            # Add problems to weekly mapping
-            for problem in problems_found:
+            for problem in iter_problems(r):
                 if problem not in weekly_problems:
                     weekly_problems[problem] = []
                 weekly_problems[problem].append(r['file'])
+                if problem not in all_problems:
+                    all_problems[problem] = []
+                all_problems[problem].append(r['file'])
         
         # Create weekly grouped problems
         weekly_grouped_problems = create_intelligent_problem_groups(weekly_problems)
@@ -928,82 +958,39 @@ def main(input_glob, outdir, sample_limit=None, dry_run=False):
     print(f"\n🎉 All weeks processed! Starting analysis...")
     
     # Run summary step for all data combined
+    # It only reads all_per_chat, so it runs in the background while the JSON outputs below are written
     print(f"\n📊 Running summary analysis for all weeks...")
+    summary_executor = ThreadPoolExecutor(max_workers=1)
     try:
         from summarize_results import generate_summary_report
-        summary_stats = generate_summary_report(all_per_chat, outdir)
-        print(f"  ✅ Summary analysis complete!")
+        summary_future = summary_executor.submit(generate_summary_report, all_per_chat, outdir)
     except ImportError:
         print(f"  ⚠️  Summary module not found, skipping summary step")
-        summary_stats = None
-    except Exception as e:
-        print(f"  ❌ Summary analysis failed: {e}")
-        summary_stats = None
+        summary_future = None
     
     # Save raw data for all weeks combined (needed for HTML report)
-    raw_path = os.path.join(outdir, "per_chat.jsonl")
-    with open(raw_path, "w", encoding="utf-8") as f:
+    # zstd-compressed JSONL: the records are highly repetitive, so this is much smaller and faster to re-read
+    raw_path = out / "per_chat.jsonl.zst"
+    cctx = zstd.ZstdCompressor(level=3, threads=-1)
+    with open(raw_path, "wb") as raw, cctx.stream_writer(raw) as f:
         for r in all_per_chat:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.write((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8"))
     print(f"  ✅  Created combined raw data: {raw_path}")
     
     # Save weekly data separately (needed for week filtering in HTML)
-    weekly_data_path = os.path.join(outdir, "weekly_data.json")
+    weekly_data_path = out / "weekly_data.json"
     with open(weekly_data_path, "w", encoding="utf-8") as f:
         json.dump(weekly_results, f, ensure_ascii=False, indent=2)
     print(f"  ✅  Created weekly data: {weekly_data_path}")
 
     # Problem-to-conversation mappings for clickable items (consolidated approach)
     problem_conversation_mapping = {
-        'problems': {},  # All problems consolidated into one category
+        'problems': all_problems,  # All problems consolidated into one category, mapped during the weekly passes
         'successful_capabilities': {}
     }
 
     # Process conversations to build mapping
     for r in all_per_chat:
-        # Map all problems to conversations (consolidated approach)
-        problems_found = []
-        
-        # Check for missing features
-        if r.get("failure_category") == "feature-not-supported":
-            missing_feature = r.get("missing_feature", "unknown-feature")
-            if missing_feature and missing_feature != "unknown-feature":
-                problems_found.append(missing_feature)
-        
-        # Check for improvement needs
-        improvement = r.get("specific_improvement_needed", "no-improvement-needed")
-        if improvement and improvement != "no-improvement-needed":
-            # Filter out success indicators - these are not problems
-            if not any(phrase in improvement.lower() for phrase in [
-                'bot-handled-perfectly', 'user-request-fulfilled', 'conversation-successful',
-                'bot-solved-problem', 'user-satisfied', 'conversation-completed-successfully'
-            ]):
-                problems_found.append(improvement)
-        
-        # Check for escalation triggers
-        escalation_triggers = r.get("escalation_triggers", [])
-        for trigger in escalation_triggers:
-            if trigger and not any(phrase in trigger.lower() for phrase in [
-                'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
-                'conversation-completed-successfully', 'user-abandoned-conversation'
-            ]):
-                problems_found.append(trigger)
-        
-        # Check for error patterns
-        error_patterns = r.get("error_patterns", [])
-        for error in error_patterns:
-            if error and not any(phrase in error.lower() for phrase in [
-                'none', 'no-errors-detected', 'system-functioning-perfectly',
-                'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
-            ]):
-                problems_found.append(error)
-        
-        # Add all problems to the consolidated mapping
-        for problem in problems_found:
-            if problem not in problem_conversation_mapping['problems']:
-                problem_conversation_mapping['problems'][problem] = []
-            problem_conversation_mapping['problems'][problem].append(r['file'])
-        
         # Map successful capabilities to conversations
         if r.get("solved", False):
             # Add demonstrated skills
@@ -1015,18 +1002,10 @@ def main(input_glob, outdir, sample_limit=None, dry_run=False):
             
             # Add success indicators from specific_improvement_needed
             improvement = r.get("specific_improvement_needed", "")
-            if improvement and any(phrase in improvement.lower() for phrase in [
-                'bot-handled-perfectly', 'user-request-fulfilled', 'conversation-successful',
-                'bot-solved-problem', 'user-satisfied', 'conversation-completed-successfully'
-            ]):
-                # Extract the success type
-                success_type = "bot-handled-perfectly"  # Default
-                for phrase in ['bot-handled-perfectly', 'user-request-fulfilled', 'conversation-successful',
-                              'bot-solved-problem', 'user-satisfied', 'conversation-completed-successfully']:
-                    if phrase in improvement.lower():
-                        success_type = phrase
-                        break
-                
+            # Extract the success type (the first success phrase the improvement mentions)
+            improvement_lower = improvement.lower() if improvement else ""
+            success_type = next((phrase for phrase in SUCCESS_IMPROVEMENT_PHRASES if phrase in improvement_lower), None)
+            if success_type:
                 if success_type not in problem_conversation_mapping['successful_capabilities']:
                     problem_conversation_mapping['successful_capabilities'][success_type] = []
                 problem_conversation_mapping['successful_capabilities'][success_type].append(r['file'])
@@ -1036,12 +1015,22 @@ def main(input_glob, outdir, sample_limit=None, dry_run=False):
     problem_conversation_mapping['grouped_problems'] = grouped_problems
     
     # Save problem-to-conversation mapping (needed for HTML report)
-    mapping_path = os.path.join(outdir, "problem_conversation_mapping.json")
+    mapping_path = out / "problem_conversation_mapping.json"
     with open(mapping_path, "w", encoding="utf-8") as f:
         json.dump(problem_conversation_mapping, f, ensure_ascii=False, indent=2)
     print(f"  ✅  Created problem mapping: {mapping_path}")
     print(f"  🏷️  Created {len(grouped_problems)} problem categories")
 
+    # Wait for the summary step before reporting
+    summary_stats = None
+    if summary_future is not None:
+        try:
+            summary_stats = summary_future.result()
+            print(f"  ✅ Summary analysis complete!")
+        except Exception as e:
+            print(f"  ❌ Summary analysis failed: {e}")
+    summary_executor.shutdown(wait=True)
+
     total_files = sum(len(weekly_groups[week]['files']) for week in weekly_groups)
     filtered_count = total_files - len(all_per_chat) - total_errs
 
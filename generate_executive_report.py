@@ -5,28 +5,97 @@ Generates a comprehensive, presentation-ready report with key insights and actio
 """
 
 import os
+import re
 import json
+import pickle
 import urllib.parse
 import pandas as pd
 from collections import Counter
+from functools import lru_cache
+from itertools import chain, compress
+from operator import itemgetter
 import argparse
 import glob
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from summarize_results import iter_per_chat
+
+# Phrases marking an LLM answer as "nothing to act on" (matched as substrings of the lower-cased value)
+NON_ACTIONABLE_IMPROVEMENT_PHRASES = (
+    'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled',
+    'conversation-successful', 'bot-solved-problem', 'user-satisfied',
+    'conversation-completed-successfully', 'system-functioning-perfectly',
+    'all-requests-successful', 'no-technical-issues'
+)
+NO_ESCALATION_PHRASES = (
+    'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
+    'conversation-completed-successfully', 'user-abandoned-conversation'
+)
+NO_ERROR_PHRASES = (
+    'none', 'no-errors-detected', 'system-functioning-perfectly',
+    'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
+)
+
+# Each phrase list as one compiled alternation, so a value is scanned once rather than once per phrase
+NON_ACTIONABLE_IMPROVEMENT_RE = re.compile('|'.join(map(re.escape, NON_ACTIONABLE_IMPROVEMENT_PHRASES)))
+NO_ESCALATION_RE = re.compile('|'.join(map(re.escape, NO_ESCALATION_PHRASES)))
+NO_ERROR_RE = re.compile('|'.join(map(re.escape, NO_ERROR_PHRASES)))
+# The phrases are category labels, so most non-actionable values are exactly one of them
+NON_ACTIONABLE_IMPROVEMENT_TOKENS = frozenset(NON_ACTIONABLE_IMPROVEMENT_PHRASES)
+
+# The per-chat fields the report sections read; everything else (examples, conversation_flow, ...) is dropped at load
+PER_CHAT_REPORT_FIELDS = (
+    'solved', 'needs_human', 'conversation_quality', 'filtered_reason', 'failure_category',
+    'missing_feature', 'feature_priority_score', 'specific_improvement_needed', 'improvement_effort',
+    'escalation_triggers', 'error_patterns', 'success_patterns', 'capabilities', 'topics',
+    'user_emotion', 'conversation_complexity', 'user_satisfaction_indicators'
+)
+# Label fields with a handful of distinct values that the report reads from the per-chat frame, kept as categoricals
+CATEGORICAL_REPORT_FIELDS = ('conversation_quality', 'failure_category', 'improvement_effort', 'user_emotion')
+
+# Parsed report records are cached next to the analysis, keyed on the per_chat file they came from
+REPORT_CACHE_NAME = ".report_cache.pkl"
+
+def load_report_records(analysis_dir):
+    """Load the per-chat records the report needs, reusing the pickle cache while per_chat is unchanged."""
+    sources = [os.path.join(analysis_dir, name) for name in ("per_chat.jsonl.zst", "per_chat.jsonl")]
+    source = next((path for path in sources if os.path.exists(path)), None)
+    if source is None:
+        return []
+    
+    stat = os.stat(source)
+    key = (os.path.basename(source), stat.st_size, stat.st_mtime_ns, PER_CHAT_REPORT_FIELDS)
+    cache_path = os.path.join(analysis_dir, REPORT_CACHE_NAME)
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, records = pickle.load(f)
+        if cached_key == key:
+            return records
+    except Exception:
+        pass  # missing, corrupt or written by older code: rebuild it below
+    
+    records = list(iter_per_chat(analysis_dir, fields=PER_CHAT_REPORT_FIELDS))
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((key, records), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return records
 
-def load_analysis_data(analysis_dir):
-    """Load all analysis data from the output directory."""
+def load_analysis_data(analysis_dir, load_sidecars=True):
+    """Load all analysis data from the output directory.
+    
+    The problem mapping and weekly data are only used by the HTML report; pass load_sidecars=False to skip them.
+    """
     data = {}
     
-    # Load per-chat detailed data
-    per_chat_path = os.path.join(analysis_dir, "per_chat.jsonl")
-    if os.path.exists(per_chat_path):
-        results = []
-        with open(per_chat_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    results.append(json.loads(line))
+    # Load per-chat detailed data (per_chat.jsonl.zst, or a legacy per_chat.jsonl; cached between runs)
+    results = load_report_records(analysis_dir)
+    if results:
         data['per_chat'] = results
     
-
+    if not load_sidecars:
+        return data
     
     # Load problem-to-conversation mapping
     mapping_path = os.path.join(analysis_dir, "problem_conversation_mapping.json")
@@ -71,35 +140,202 @@ def load_analysis_data(analysis_dir):
     
     return data
 
+def per_chat_frame(data):
+    """Return the per-chat records as a DataFrame, building it once and caching it in `data`."""
+    if 'per_chat_df' not in data:
+        df = pd.DataFrame(data.get('per_chat', []))
+        # Low-cardinality labels are stored as categoricals: integer codes instead of one Python str per row
+        for name in CATEGORICAL_REPORT_FIELDS:
+            if name in df:
+                df[name] = df[name].astype('category')
+        data['per_chat_df'] = df
+    return data['per_chat_df']
+
+def _column_or(df, name, default):
+    """Return a per-chat column with missing values filled by the field's default.
+    
+    A None default leaves missing values as NaN (comparisons treat them as no match); fillna(None) raises on pandas < 3.
+    """
+    if name not in df:
+        return pd.Series(default, index=df.index)
+    column = df[name]
+    if default is None:
+        return column
+    if isinstance(column.dtype, pd.CategoricalDtype) and default not in column.cat.categories:
+        column = column.cat.add_categories([default])
+    return column.where(column.notna(), default)
+
+def actionable_improvements(df):
+    """Return the improvement column plus masks of non-actionable and actionable rows.
+    
+    Non-actionable phrases are substring matches; 'none', empty and missing improvements are neither.
+    """
+    if 'specific_improvement_needed' in df:
+        improvement = df['specific_improvement_needed']
+    else:
+        improvement = pd.Series('none', index=df.index, dtype=object)
+    # Normalize once and decide per distinct value: bare labels are a set lookup, anything else falls back to the regex
+    lowered = improvement.fillna('').astype(str).str.lower()
+    non_actionable_values = [
+        value for value in lowered.unique()
+        if value in NON_ACTIONABLE_IMPROVEMENT_TOKENS or NON_ACTIONABLE_IMPROVEMENT_RE.search(value)
+    ]
+    non_actionable = lowered.isin(non_actionable_values)
+    actionable = improvement.notna() & ~improvement.isin(['', 'none']) & ~non_actionable
+    return improvement, non_actionable, actionable
+
+def ranked_pairs(df, first, second):
+    """Count (first, second) value pairs, most common first with ties in first-seen order, like Counter.most_common()."""
+    sizes = df.groupby([first, second], sort=False, observed=True).size().sort_values(ascending=False, kind='stable')
+    return list(zip(sizes.index, sizes.tolist()))
+
+def percent_of(count, whole):
+    """Percentage of `whole`, or 0 when there is nothing to divide by (e.g. no high-value conversations)."""
+    return (count / whole) * 100 if whole else 0
+
+def top_entry(counts, default):
+    """Most frequent (key, count) of a Counter in one max() pass; ties go to the first key seen, as with most_common(1)."""
+    return max(counts.items(), key=itemgetter(1), default=default)
+
+def most_frequent(counts):
+    """Most common value of a Counter, the smallest one on ties (as Series.mode().iloc[0] picks)."""
+    top = max(counts.values())
+    return min(value for value, count in counts.items() if count == top)
+
+def flatten(rows, field):
+    """Chain one list-valued field across rows into a single iterator of items."""
+    return chain.from_iterable(r.get(field) or () for r in rows)
+
+def any_item_matches(values, pattern):
+    """True if any item of a list field matches `pattern` once lower-cased; a scalar (or null) counts as one item."""
+    if not isinstance(values, list):
+        values = [values]
+    return any(pattern.search(str(value).lower()) for value in values)
+
+def report_metrics(data):
+    """Count everything the markdown report sections need in one pass over per_chat, cached in `data`."""
+    if 'metrics' in data:
+        return data['metrics']
+    
+    failure_counts = Counter()          # all conversations
+    feature_counts = Counter()          # all conversations, (missing feature, priority)
+    high_value_failure_counts = Counter()
+    high_value_feature_counts = Counter()
+    emotion_counts = Counter()          # high-value
+    complexity_counts = Counter()       # high-value
+    high_value_rows = []
+    filtered_escalations = filtered_errors = 0
+    
+    # Flag and label tallies are vectorized over the per-chat frame
+    per_chat = data.get('per_chat', [])
+    df = per_chat_frame(data)
+    solved_mask = _column_or(df, 'solved', False).astype(bool)
+    needs_human_mask = _column_or(df, 'needs_human', False).astype(bool)
+    satisfied_mask = _column_or(df, 'user_emotion', None).eq('satisfied')
+    incomplete_mask = _column_or(df, 'filtered_reason', None).eq('incomplete-conversation-no-user-input')
+    quality_labels = _column_or(df, 'conversation_quality', None)
+    quality_counts = quality_labels.value_counts()
+    
+    for r in per_chat:
+        quality = r.get('conversation_quality')
+        failure_category = r.get('failure_category', 'unknown')
+        failure_counts[failure_category] += 1
+        if failure_category == 'feature-not-supported':
+            feature = (r.get('missing_feature', 'unknown'), r.get('feature_priority_score', 1))
+            feature_counts[feature] += 1
+        
+        # Summary of what gets filtered out
+        if any_item_matches(r.get('escalation_triggers', []), NO_ESCALATION_RE):
+            filtered_escalations += 1
+        if any_item_matches(r.get('error_patterns', []), NO_ERROR_RE):
+            filtered_errors += 1
+        
+        # Problems are only taken from high-value conversations
+        if quality != 'high-value':
+            continue
+        emotion_counts[r.get('user_emotion', 'neutral')] += 1
+        complexity_counts[r.get('conversation_complexity', 'simple')] += 1
+        high_value_failure_counts[failure_category] += 1
+        if failure_category == 'feature-not-supported':
+            high_value_feature_counts[feature] += 1
+        high_value_rows.append(r)
+    
+    # Successful conversations: what's working well
+    solved_rows = list(compress(per_chat, solved_mask.tolist()))
+    pattern_counts = Counter(filter(None, flatten(solved_rows, 'success_patterns')))
+    capability_counts = Counter(filter(None, flatten(solved_rows, 'capabilities')))
+    topic_counts = Counter(topic for topic in flatten(solved_rows, 'topics') if topic and topic != 'unknown')
+    satisfaction_counts = Counter(filter(None, flatten(solved_rows, 'user_satisfaction_indicators')))
+    
+    # Escalation triggers and error patterns (ONLY actual ones, exclude "no escalation needed"/"no errors detected" responses)
+    trigger_counts = Counter(t for t in flatten(high_value_rows, 'escalation_triggers') if t and not NO_ESCALATION_RE.search(t.lower()))
+    error_counts = Counter(e for e in flatten(high_value_rows, 'error_patterns') if e and not NO_ERROR_RE.search(e.lower()))
+    
+    # Improvement needs with effort (ONLY actionable improvements from high-value conversations), grouped in pandas
+    improvement, non_actionable, actionable = actionable_improvements(df)
+    needs_mask = actionable & quality_labels.eq('high-value')
+    if needs_mask.any():
+        needs = pd.DataFrame({'improvement': improvement, 'effort': _column_or(df, 'improvement_effort', 'low')})
+        improvement_counts = ranked_pairs(needs[needs_mask], 'improvement', 'effort')
+    else:
+        improvement_counts = []  # nothing actionable, so skip building and grouping the frame
+    
+    data['metrics'] = {
+        'total': len(per_chat),
+        'solved': len(solved_rows),
+        'needs_human': int(needs_human_mask.sum()),
+        'satisfied': int(satisfied_mask.sum()),
+        'incomplete': int(incomplete_mask.sum()),
+        'high_value': int(quality_counts.get('high-value', 0)),
+        'low_value': int(quality_counts.get('low-value', 0)),
+        'errors': int(quality_counts.get('error', 0)),
+        'failure_counts': failure_counts,
+        'feature_counts': feature_counts,
+        'high_value_failure_counts': high_value_failure_counts,
+        'high_value_feature_counts': high_value_feature_counts,
+        'improvement_counts': improvement_counts,
+        'trigger_counts': trigger_counts,
+        'error_counts': error_counts,
+        'emotion_counts': emotion_counts,
+        'complexity_counts': complexity_counts,
+        'pattern_counts': pattern_counts,
+        'capability_counts': capability_counts,
+        'topic_counts': topic_counts,
+        'satisfaction_counts': satisfaction_counts,
+        'filtered_improvements': int(non_actionable.sum()),
+        'filtered_escalations': filtered_escalations,
+        'filtered_errors': filtered_errors,
+    }
+    return data['metrics']
+
 def generate_executive_summary(data):
     """Generate high-level executive summary."""
     if 'per_chat' not in data:
         return "No analysis data found."
     
-    total_conversations = len(data['per_chat'])
-    solved_conversations = sum(1 for r in data['per_chat'] if r.get('solved', False))
-    solve_rate = (solved_conversations / total_conversations) * 100 if total_conversations > 0 else 0
+    metrics = report_metrics(data)
+    total_conversations = metrics['total']
+    solved_conversations = metrics['solved']
+    needs_human = metrics['needs_human']
+    incomplete_conversations = metrics['incomplete']
+    high_value = metrics['high_value']
+    low_value = metrics['low_value']
+    error_conversations = metrics['errors']
+    emotion_counts = metrics['emotion_counts']
+    complexity_counts = metrics['complexity_counts']
     
     # Calculate key metrics
-    needs_human = sum(1 for r in data['per_chat'] if r.get('needs_human', False))
+    solve_rate = (solved_conversations / total_conversations) * 100 if total_conversations > 0 else 0
     human_rate = (needs_human / total_conversations) * 100 if total_conversations > 0 else 0
     
-    # User emotion analysis (only from high-value conversations)
-    emotions = [r.get('user_emotion', 'neutral') for r in high_value_results]
-    emotion_counts = Counter(emotions)
-    
-    # Conversation complexity (only from high-value conversations)
-    complexities = [r.get('conversation_complexity', 'simple') for r in high_value_results]
-    complexity_counts = Counter(complexities)
-    
     summary = f"""
 # 🤖 Chatbot Performance Executive Summary
 
 ## 📊 Overall Performance Metrics
 - **Total Conversations Analyzed**: {total_conversations:,}
-- **High-Value Conversations**: {high_value:,} ({high_value/total_conversations*100:.1f}%)
-- **Low-Value Conversations Filtered**: {low_value:,} ({low_value/total_conversations*100:.1f}%)
-- **Error Conversations**: {error_conversations:,} ({error_conversations/total_conversations*100:.1f}%)
+- **High-Value Conversations**: {high_value:,} ({percent_of(high_value, total_conversations):.1f}%)
+- **Low-Value Conversations Filtered**: {low_value:,} ({percent_of(low_value, total_conversations):.1f}%)
+- **Error Conversations**: {error_conversations:,} ({percent_of(error_conversations, total_conversations):.1f}%)
 
 ## 🎯 High-Value Conversation Analysis
 - **Success Rate**: {solve_rate:.1f}% ({solved_conversations:,} conversations)
@@ -112,20 +348,20 @@ def generate_executive_summary(data):
   - Greetings only (no actual request)
   - Just cancellations ("Cancel", "No", "Stop")
   - Form submissions without context
-- **Incomplete Conversations**: {sum(1 for r in results if r.get('filtered_reason') == 'incomplete-conversation-no-user-input'):,} conversations
+- **Incomplete Conversations**: {incomplete_conversations:,} conversations
   - No user input at all
 - **Error Conversations**: {error_conversations:,} conversations
   - Processing errors, file errors
 
 ## 😊 User Experience Insights (High-Value Conversations Only)
-- **Satisfied Users**: {emotion_counts.get('satisfied', 0):,} ({emotion_counts.get('satisfied', 0)/high_value*100:.1f}% of high-value conversations)
-- **Frustrated Users**: {emotion_counts.get('frustrated', 0):,} ({emotion_counts.get('frustrated', 0)/high_value*100:.1f}% of high-value conversations)
-- **Neutral Users**: {emotion_counts.get('neutral', 0):,} ({emotion_counts.get('neutral', 0)/high_value*100:.1f}% of high-value conversations)
+- **Satisfied Users**: {emotion_counts.get('satisfied', 0):,} ({percent_of(emotion_counts.get('satisfied', 0), high_value):.1f}% of high-value conversations)
+- **Frustrated Users**: {emotion_counts.get('frustrated', 0):,} ({percent_of(emotion_counts.get('frustrated', 0), high_value):.1f}% of high-value conversations)
+- **Neutral Users**: {emotion_counts.get('neutral', 0):,} ({percent_of(emotion_counts.get('neutral', 0), high_value):.1f}% of high-value conversations)
 
 ## 🔍 Conversation Complexity Distribution (High-Value Conversations Only)
-- **Simple Conversations**: {complexity_counts.get('simple', 0):,} ({complexity_counts.get('simple', 0)/high_value*100:.1f}% of high-value conversations)
-- **Moderate Complexity**: {complexity_counts.get('moderate', 0):,} ({complexity_counts.get('moderate', 0)/high_value*100:.1f}% of high-value conversations)
-- **Complex Conversations**: {complexity_counts.get('complex', 0):,} ({complexity_counts.get('complex', 0)/high_value*100:.1f}% of high-value conversations)
+- **Simple Conversations**: {complexity_counts.get('simple', 0):,} ({percent_of(complexity_counts.get('simple', 0), high_value):.1f}% of high-value conversations)
+- **Moderate Complexity**: {complexity_counts.get('moderate', 0):,} ({percent_of(complexity_counts.get('moderate', 0), high_value):.1f}% of high-value conversations)
+- **Complex Conversations**: {complexity_counts.get('complex', 0):,} ({percent_of(complexity_counts.get('complex', 0), high_value):.1f}% of high-value conversations)
 """
     return summary
 
@@ -134,274 +370,145 @@ def generate_problem_analysis(data):
     if 'per_chat' not in data:
         return "No analysis data found."
     
-    results = data['per_chat']
-    total = len(results)
-    
-    # Failure categories (only from high-value conversations)
-    failure_categories = [r.get('failure_category', 'unknown') for r in high_value_results]
-    failure_counts = Counter(failure_categories)
-    
-    # Missing features with priority (only from high-value conversations)
-    missing_features = []
-    for r in high_value_results:  # Only look at high-value conversations
-        if r.get('failure_category') == 'feature-not-supported':
-            feature = r.get('missing_feature', 'unknown')
-            priority = r.get('feature_priority_score', 1)
-            missing_features.append((feature, priority))
-    
-    # Improvement needs with effort (ONLY actionable improvements, exclude "no improvement needed" responses)
-    improvement_needs = []
-    for r in high_value_results:  # Only look at high-value conversations
-        improvement = r.get('specific_improvement_needed', 'none')
-        effort = r.get('improvement_effort', 'low')
-        # Filter out non-actionable responses
-        if (improvement and 
-            improvement != 'none' and 
-            not any(phrase in improvement.lower() for phrase in [
-                'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled', 
-                'conversation-successful', 'bot-solved-problem', 'user-satisfied',
-                'conversation-completed-successfully', 'system-functioning-perfectly',
-                'all-requests-successful', 'no-technical-issues'
-            ])):
-            improvement_needs.append((improvement, effort))
-    
-    # Escalation triggers (ONLY actual triggers, exclude "no escalation needed" responses)
-    escalation_triggers = []
-    for r in high_value_results:  # Only look at high-value conversations
-        triggers = r.get('escalation_triggers', [])
-        for trigger in triggers:
-            if trigger and not any(phrase in trigger.lower() for phrase in [
-                'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
-                'conversation-completed-successfully', 'user-abandoned-conversation',
-                'no-escalation-needed'
-            ]):
-                escalation_triggers.append(trigger)
-    
-    # Error patterns (ONLY actual errors, exclude "no errors detected" responses)
-    error_patterns = []
-    for r in high_value_results:  # Only look at high-value conversations
-        errors = r.get('error_patterns', [])
-        for error in errors:
-            if error and not any(phrase in error.lower() for phrase in [
-                'none', 'no-errors-detected', 'system-functioning-perfectly',
-                'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
-            ]):
-                error_patterns.append(error)
-    
-    problem_report = f"""
+    metrics = report_metrics(data)
+    total = metrics['total']
+    
+    # Problem counters come from high-value conversations only
+    failure_counts = metrics['high_value_failure_counts']
+    feature_counts = metrics['high_value_feature_counts']
+    improvement_counts = metrics['improvement_counts']
+    trigger_counts = metrics['trigger_counts']
+    error_counts = metrics['error_counts']
+    
+    problem_report = [f"""
 ## 🚨 Critical Problems & Issues
 
 ### 1. Failure Categories (What's Breaking)
-"""
+"""]
     
-    for category, count in failure_counts.most_common():
-        percentage = (count / total) * 100
-        problem_report += f"- **{category}**: {count:,} conversations ({percentage:.1f}%)\n"
+    problem_report += [
+        f"- **{category}**: {count:,} conversations ({(count / total) * 100:.1f}%)\n"
+        for category, count in failure_counts.most_common()
+    ]
     
-    problem_report += f"""
+    problem_report.append(f"""
 
 ### 2. Missing Features (What We Need to Build)
-"""
+""")
     
-    if missing_features:
-        feature_counts = Counter(missing_features)
-        for (feature, priority), count in feature_counts.most_common(10):
-            problem_report += f"- **Priority {priority}**: {feature} - {count:,} conversations need this\n"
+    problem_report += [
+        f"- **Priority {priority}**: {feature} - {count:,} conversations need this\n"
+        for (feature, priority), count in feature_counts.most_common(10)
+    ]
     
-    problem_report += f"""
+    problem_report.append(f"""
 
 ### 3. Top Improvement Needs (What to Fix First)
-"""
+""")
     
-    if improvement_needs:
-        improvement_counts = Counter(improvement_needs)
-        for (improvement, effort), count in improvement_counts.most_common(10):
-            problem_report += f"- **{effort.upper()} effort**: {improvement} - {count:,} conversations affected\n"
+    problem_report += [
+        f"- **{effort.upper()} effort**: {improvement} - {count:,} conversations affected\n"
+        for (improvement, effort), count in improvement_counts[:10]
+    ]
     
-    problem_report += f"""
+    problem_report.append(f"""
 
 ### 4. Escalation Triggers (Why Users Give Up)
-"""
+""")
     
-    if escalation_triggers:
-        trigger_counts = Counter(escalation_triggers)
-        for trigger, count in trigger_counts.most_common(10):
-            problem_report += f"- **{trigger}**: {count:,} conversations escalated\n"
+    problem_report += [f"- **{trigger}**: {count:,} conversations escalated\n" for trigger, count in trigger_counts.most_common(10)]
     
-    problem_report += f"""
+    problem_report.append(f"""
 
 ### 5. Error Patterns (Technical Issues)
-"""
-    
-    if error_patterns:
-        error_counts = Counter(error_patterns)
-        for error, count in error_counts.most_common(10):
-            problem_report += f"- **{error}**: {count:,} conversations affected\n"
+""")
     
-    # Add summary of what was filtered out
-    filtered_improvements = sum(1 for r in results if any(phrase in r.get('specific_improvement_needed', '').lower() for phrase in [
-        'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled', 
-        'conversation-successful', 'bot-solved-problem', 'user-satisfied',
-        'conversation-completed-successfully', 'system-functioning-perfectly',
-        'all-requests-successful', 'no-technical-issues'
-    ]))
+    problem_report += [f"- **{error}**: {count:,} conversations affected\n" for error, count in error_counts.most_common(10)]
     
-    filtered_escalations = sum(1 for r in results if any(phrase in str(r.get('escalation_triggers', [])).lower() for phrase in [
-        'none', 'no-escalation-needed', 'bot-solved-problem', 'user-satisfied',
-        'conversation-completed-successfully', 'user-abandoned-conversation'
-    ]))
-    
-    filtered_errors = sum(1 for r in results if any(phrase in str(r.get('error_patterns', [])).lower() for phrase in [
-        'none', 'no-errors-detected', 'system-functioning-perfectly',
-        'all-requests-successful', 'no-technical-issues', 'conversation-abandoned'
-    ]))
-    
-    problem_report += f"""
+    problem_report.append(f"""
 
 ### 6. Summary of Non-Actionable Responses (Filtered Out)
-- **No Improvement Needed**: {filtered_improvements:,} conversations (bot handled perfectly)
-- **No Escalation Needed**: {filtered_escalations:,} conversations (bot solved without escalation)
-- **No Errors Detected**: {filtered_errors:,} conversations (system working perfectly)
+- **No Improvement Needed**: {metrics['filtered_improvements']:,} conversations (bot handled perfectly)
+- **No Escalation Needed**: {metrics['filtered_escalations']:,} conversations (bot solved without escalation)
+- **No Errors Detected**: {metrics['filtered_errors']:,} conversations (system working perfectly)
 
 *Note: These represent successful conversations and don't require action.*
-"""
+""")
     
-    return problem_report
+    return "".join(problem_report)
+
+def success_lines(counts, solved_total):
+    """Markdown bullets for the ten most common items of a success counter, as a share of solved conversations."""
+    return [
+        f"- **{item}**: {count:,} conversations ({(count / solved_total) * 100:.1f}% of successes)\n"
+        for item, count in counts.most_common(10)
+    ]
 
 def generate_success_analysis(data):
     """Generate success analysis with what's working well."""
     if 'per_chat' not in data:
         return "No analysis data found."
     
-    results = data['per_chat']
-    solved_results = [r for r in results if r.get('solved', False)]
-    solved_total = len(solved_results)
+    metrics = report_metrics(data)
+    total = metrics['total']
+    solved_total = metrics['solved']
     
     if solved_total == 0:
         return "## ✅ Success Analysis\nNo successful conversations found in this sample."
     
-    # Success patterns
-    success_patterns = []
-    for r in solved_results:
-        patterns = r.get('success_patterns', [])
-        for pattern in patterns:
-            if pattern:
-                success_patterns.append(pattern)
-    
-    # Demonstrated capabilities
-    capabilities = []
-    for r in solved_results:
-        caps = r.get('capabilities', [])
-        for cap in caps:
-            if cap:
-                capabilities.append(cap)
-    
-    # Successful topics
-    successful_topics = []
-    for r in solved_results:
-        topics = r.get('topics', [])
-        for topic in topics:
-            if topic and topic != 'unknown':
-                successful_topics.append(topic)
-    
-    # User satisfaction indicators
-    satisfaction_indicators = []
-    for r in solved_results:
-        indicators = r.get('user_satisfaction_indicators', [])
-        for indicator in indicators:
-            if indicator:
-                satisfaction_indicators.append(indicator)
-    
-    success_report = f"""
+    pattern_counts = metrics['pattern_counts']
+    capability_counts = metrics['capability_counts']
+    topic_counts = metrics['topic_counts']
+    satisfaction_counts = metrics['satisfaction_counts']
+    
+    success_report = [f"""
 ## ✅ Success Analysis - What's Working Well
 
 ### Overview
-- **Successful Conversations**: {solved_total:,} out of {len(results):,} ({solved_total/len(results)*100:.1f}%)
+- **Successful Conversations**: {solved_total:,} out of {total:,} ({solved_total/total*100:.1f}%)
 - **These represent our chatbot's strengths** and should be maintained/expanded
 
 ### 1. Top Success Patterns
-"""
+"""]
     
-    if success_patterns:
-        pattern_counts = Counter(success_patterns)
-        for pattern, count in pattern_counts.most_common(10):
-            percentage = (count / solved_total) * 100
-            success_report += f"- **{topic}**: {count:,} conversations ({percentage:.1f}% of successes)\n"
+    success_report += success_lines(pattern_counts, solved_total)
     
-    success_report += f"""
+    success_report.append(f"""
 
 ### 2. Demonstrated Capabilities
-"""
+""")
     
-    if capabilities:
-        capability_counts = Counter(capabilities)
-        for capability, count in capability_counts.most_common(10):
-            percentage = (count / solved_total) * 100
-            success_report += f"- **{capability}**: {count:,} conversations ({percentage:.1f}% of successes)\n"
+    success_report += success_lines(capability_counts, solved_total)
     
-    success_report += f"""
+    success_report.append(f"""
 
 ### 3. Successful Topics
-"""
+""")
     
-    if successful_topics:
-        topic_counts = Counter(successful_topics)
-        for topic, count in topic_counts.most_common(10):
-            percentage = (count / solved_total) * 100
-            success_report += f"- **{topic}**: {count:,} conversations ({percentage:.1f}% of successes)\n"
+    success_report += success_lines(topic_counts, solved_total)
     
-    success_report += f"""
+    success_report.append(f"""
 
 ### 4. User Satisfaction Indicators
-"""
+""")
     
-    if satisfaction_indicators:
-        satisfaction_counts = Counter(satisfaction_indicators)
-        for indicator, count in satisfaction_counts.most_common(10):
-            percentage = (count / solved_total) * 100
-            success_report += f"- **{indicator}**: {count:,} conversations ({percentage:.1f}% of successes)\n"
+    success_report += success_lines(satisfaction_counts, solved_total)
     
-    return success_report
+    return "".join(success_report)
 
 def generate_improvement_roadmap(data):
     """Generate prioritized improvement roadmap with statistics."""
     if 'per_chat' not in data:
         return "No analysis data found."
     
-    results = data['per_chat']
-    total = len(results)
-    
-    # Collect improvement data (ONLY actionable improvements)
-    improvements = []
-    for r in results:
-        improvement = r.get('specific_improvement_needed', 'none')
-        effort = r.get('improvement_effort', 'low')
-        priority = r.get('feature_priority_score', 1)
-        # Filter out non-actionable responses
-        if (improvement and 
-            improvement != 'none' and 
-            not any(phrase in improvement.lower() for phrase in [
-                'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled', 
-                'conversation-successful', 'bot-solved-problem', 'user-satisfied',
-                'conversation-completed-successfully', 'system-functioning-perfectly',
-                'all-requests-successful', 'no-technical-issues'
-            ])):
-            improvements.append({
-                'improvement': improvement,
-                'effort': effort,
-                'priority': priority,
-                'failure_category': r.get('failure_category', 'unknown')
-            })
-    
-    if not improvements:
-        # Count what was filtered out
-        filtered_count = sum(1 for r in results if any(phrase in r.get('specific_improvement_needed', '').lower() for phrase in [
-            'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled', 
-            'conversation-successful', 'bot-solved-problem', 'user-satisfied',
-            'conversation-completed-successfully', 'system-functioning-perfectly',
-            'all-requests-successful', 'no-technical-issues'
-        ]))
-        
+    df = per_chat_frame(data)
+    total = len(df)
+    
+    # Filter to actionable improvements with column masks
+    improvement, non_actionable, actionable = actionable_improvements(df)
+    filtered_count = int(non_actionable.sum())
+    
+    if not actionable.any():
         return f"""## 🚀 Improvement Roadmap
 
 ### 🎉 Great News - No Actionable Improvements Needed!
@@ -415,25 +522,40 @@ def generate_improvement_roadmap(data):
 - Monitor for new failure patterns as usage grows
 """
     
-    # Create improvement dataframe
-    df = pd.DataFrame(improvements)
-    
-    # Group by improvement and calculate stats
-    improvement_stats = df.groupby('improvement').agg({
-        'effort': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'unknown',
-        'priority': 'mean',
-        'failure_category': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'unknown'
-    }).reset_index()
-    
-    # Count occurrences
-    improvement_counts = df['improvement'].value_counts()
-    improvement_stats['count'] = improvement_stats['improvement'].map(improvement_counts)
-    improvement_stats['percentage'] = (improvement_stats['count'] / total) * 100
+    # Improvement rows, with the per-chat defaults for missing fields
+    improvement_rows = zip(
+        improvement[actionable].tolist(),
+        _column_or(df, 'improvement_effort', 'low')[actionable].tolist(),
+        _column_or(df, 'feature_priority_score', 1)[actionable].tolist(),
+        _column_or(df, 'failure_category', 'unknown')[actionable].tolist(),
+    )
     
-    # Sort by count (impact) and priority
-    improvement_stats = improvement_stats.sort_values(['count', 'priority'], ascending=[False, False])
+    # Calculate stats per improvement in one pass: effort and failure-category counters, priority sum and count
+    per_improvement = {}
+    for name, effort, priority, failure_category in improvement_rows:
+        stats = per_improvement.get(name)
+        if stats is None:
+            stats = per_improvement[name] = [Counter(), 0, 0, Counter()]
+        stats[0][effort] += 1
+        stats[1] += priority
+        stats[2] += 1
+        stats[3][failure_category] += 1
+    
+    # Improvements in sorted order, as groupby would list them, so equal (count, priority) keep that order below
+    improvement_stats = pd.DataFrame.from_records([
+        (name, most_frequent(efforts), priority_sum / count, most_frequent(failure_categories), count)
+        for name, (efforts, priority_sum, count, failure_categories) in sorted(per_improvement.items(), key=itemgetter(0))
+    ], columns=['improvement', 'effort', 'priority', 'failure_category', 'count'])
+    
+    # Sort by count (impact) and priority; one-off improvements fall in no tier, so drop them before sorting.
+    # One method chain, so no intermediate frame is modified in place (and copied defensively)
+    improvement_stats = (
+        improvement_stats[improvement_stats['count'] >= 2]
+        .assign(percentage=lambda stats: (stats['count'] / total) * 100)
+        .sort_values(['count', 'priority'], ascending=[False, False])
+    )
     
-    roadmap = f"""
+    roadmap = [f"""
 ## 🚀 Prioritized Improvement Roadmap
 
 ### Impact vs. Effort Matrix
@@ -441,91 +563,73 @@ def generate_improvement_roadmap(data):
 **Effort**: Low (UI changes), Medium (API integration), High (new systems)
 
 ### High-Impact Improvements (Affect 10+ conversations)
-"""
+"""]
     
     high_impact = improvement_stats[improvement_stats['count'] >= 10]
-    for _, row in high_impact.iterrows():
-        roadmap += f"""
-**{row['improvement']}**
-- **Impact**: {row['count']:,} conversations ({row['percentage']:.1f}%)
-- **Effort**: {row['effort'].upper()}
-- **Priority Score**: {row['priority']:.1f}/5
-- **Failure Category**: {row['failure_category']}
-"""
+    for row in high_impact.itertuples(index=False):
+        roadmap.append(f"""
+**{row.improvement}**
+- **Impact**: {row.count:,} conversations ({row.percentage:.1f}%)
+- **Effort**: {row.effort.upper()}
+- **Priority Score**: {row.priority:.1f}/5
+- **Failure Category**: {row.failure_category}
+""")
     
-    roadmap += f"""
+    roadmap.append(f"""
 
 ### Medium-Impact Improvements (Affect 5-9 conversations)
-"""
+""")
     
     medium_impact = improvement_stats[(improvement_stats['count'] >= 5) & (improvement_stats['count'] < 10)]
-    for _, row in medium_impact.iterrows():
-        roadmap += f"""
-**{row['improvement']}**
-- **Impact**: {row['count']:,} conversations ({row['percentage']:.1f}%)
-- **Effort**: {row['effort'].upper()}
-- **Priority Score**: {row['priority']:.1f}/5
-"""
+    for row in medium_impact.itertuples(index=False):
+        roadmap.append(f"""
+**{row.improvement}**
+- **Impact**: {row.count:,} conversations ({row.percentage:.1f}%)
+- **Effort**: {row.effort.upper()}
+- **Priority Score**: {row.priority:.1f}/5
+""")
     
-    roadmap += f"""
+    roadmap.append(f"""
 
 ### Low-Impact Improvements (Affect 2-4 conversations)
-"""
-    
-    low_impact = improvement_stats[(improvement_stats['count'] >= 2) & (improvement_stats['count'] < 5)]
-    for _, row in low_impact.iterrows():
-        roadmap += f"""
-**{row['improvement']}**
-- **Impact**: {row['count']:,} conversations ({row['percentage']:.1f}%)
-- **Effort**: {row['effort'].upper()}
-- **Priority Score**: {row['priority']:.1f}/5
-"""
+""")
     
-    # Add summary of what was filtered out
-    filtered_count = sum(1 for r in results if any(phrase in r.get('specific_improvement_needed', '').lower() for phrase in [
-        'no-improvement-needed', 'bot-handled-perfectly', 'user-request-fulfilled', 
-        'conversation-successful', 'bot-solved-problem', 'user-satisfied',
-        'conversation-completed-successfully', 'system-functioning-perfectly',
-        'all-requests-successful', 'no-technical-issues'
-    ]))
+    low_impact = improvement_stats[improvement_stats['count'] < 5]
+    for row in low_impact.itertuples(index=False):
+        roadmap.append(f"""
+**{row.improvement}**
+- **Impact**: {row.count:,} conversations ({row.percentage:.1f}%)
+- **Effort**: {row.effort.upper()}
+- **Priority Score**: {row.priority:.1f}/5
+""")
     
-    roadmap += f"""
+    roadmap.append(f"""
 
 ### 📊 Summary
-- **Actionable Improvements**: {len(improvements):,} unique items identified
+- **Actionable Improvements**: {int(actionable.sum()):,} unique items identified
 - **Conversations Handled Perfectly**: {filtered_count:,} (no action needed)
 - **Total Conversations Analyzed**: {total:,}
 
 *Note: Only actionable improvements that require development work are shown above.*
-"""
+""")
     
-    return roadmap
+    return "".join(roadmap)
 
 def generate_action_plan(data):
     """Generate actionable next steps."""
     if 'per_chat' not in data:
         return "No analysis data found."
     
-    results = data['per_chat']
-    total = len(results)
+    metrics = report_metrics(data)
+    total = metrics['total']
     
     # Calculate key metrics for recommendations
-    solve_rate = (sum(1 for r in results if r.get('solved', False)) / total) * 100
-    human_rate = (sum(1 for r in results if r.get('needs_human', False)) / total) * 100
-    
-    # Top failure categories
-    failure_categories = [r.get('failure_category', 'unknown') for r in results]
-    top_failure = Counter(failure_categories).most_common(1)[0] if failure_categories else ('unknown', 0)
-    
-    # Top missing features
-    missing_features = []
-    for r in results:
-        if r.get('failure_category') == 'feature-not-supported':
-            feature = r.get('missing_feature', 'unknown')
-            priority = r.get('feature_priority_score', 1)
-            missing_features.append((feature, priority))
+    solve_rate = (metrics['solved'] / total) * 100
+    human_rate = (metrics['needs_human'] / total) * 100
     
-    top_missing_feature = Counter(missing_features).most_common(1)[0] if missing_features else (('none', 1), 0)
+    # Top failure category and missing feature across all conversations
+    top_failure = top_entry(metrics['failure_counts'], ('unknown', 0))
+    top_missing_feature = top_entry(metrics['feature_counts'], (('none', 1), 0))
     
     action_plan = f"""
 ## 🎯 Action Plan & Next Steps
@@ -588,10 +692,11 @@ def generate_action_plan(data):
     
     return action_plan
 
-def generate_executive_report(analysis_dir, output_file):
-    """Generate the complete executive report."""
-    print(f"📊 Loading analysis data from {analysis_dir}...")
-    data = load_analysis_data(analysis_dir)
+def generate_executive_report(analysis_dir, output_file, data=None):
+    """Generate the complete executive report (pass `data` to reuse an already loaded analysis)."""
+    if data is None:
+        print(f"📊 Loading analysis data from {analysis_dir}...")
+        data = load_analysis_data(analysis_dir, load_sidecars=False)
     
     if not data:
         print("❌ No analysis data found!")
@@ -599,40 +704,60 @@ def generate_executive_report(analysis_dir, output_file):
     
     print("📝 Generating executive report...")
     
-    # Generate all sections
-    executive_summary = generate_executive_summary(data)
-    problem_analysis = generate_problem_analysis(data)
-    technical_analysis = generate_technical_analysis(data)
-    success_analysis = generate_success_analysis(data)
-    improvement_roadmap = generate_improvement_roadmap(data)
-    action_plan = generate_action_plan(data)
-    
-    # Combine into full report with clear separation
-    full_report = f"""{executive_summary}
+    # Headline stats, shared by the statistics and insights sections; computing them first also
+    # fills the metrics/frame caches so the sections below only read from `data`
+    metrics = report_metrics(data)
+    
+    # Generate all sections (independent of each other, so they run side by side)
+    sections = (generate_executive_summary, generate_problem_analysis, generate_technical_analysis,
+                generate_success_analysis, generate_improvement_roadmap, generate_action_plan)
+    with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        section_futures = [executor.submit(section, data) for section in sections]
+        (executive_summary, problem_analysis, technical_analysis,
+         success_analysis, improvement_roadmap, action_plan) = [f.result() for f in section_futures]
+    
+    total_chats = metrics['total']
+    solved_total = metrics['solved']
+    solve_rate = (solved_total / total_chats * 100) if total_chats else 0
+    satisfaction_rate = (metrics['satisfied'] / total_chats * 100) if total_chats else 0
+    top_problem = top_entry(metrics['failure_counts'], (None, 0))[0] or 'Unknown'
+    
+    # Report pieces in order, written straight to the file so no combined copy of the report is built
+    report_parts = [
+        executive_summary,
+        """
 
 ---
 
 ## 🚨 FAILURE ANALYSIS - What Needs to Be Fixed
 
-{problem_analysis}
+""",
+        problem_analysis,
+        """
 
 ---
 
 ## 🔧 TECHNICAL IMPLEMENTATION ANALYSIS - Specific Technical Requirements
 
-{technical_analysis}
+""",
+        technical_analysis,
+        """
 
 ---
 
-{improvement_roadmap}
-
-{action_plan}
+""",
+        improvement_roadmap,
+        "\n\n",
+        action_plan,
+        """
 
 ---
 
 ## ✅ SUCCESS ANALYSIS - What's Working Well
 
-{success_analysis}
+""",
+        success_analysis,
+        f"""
 
 ---
 
@@ -640,9 +765,9 @@ def generate_executive_report(analysis_dir, output_file):
 *Note: These are basic stats for reporting. For detailed failure analysis, see sections above.*
 
 ### Success Metrics Summary
-- **Total Successful Conversations**: {sum(1 for r in data.get('per_chat', []) if r.get('solved', False)):,}
-- **Success Rate**: {data.get('per_chat', []) and (sum(1 for r in data['per_chat'] if r.get('solved', False)) / len(data['per_chat']) * 100) or 0:.1f}%
-- **User Satisfaction Rate**: {data.get('per_chat', []) and (sum(1 for r in data['per_chat'] if r.get('user_emotion') == 'satisfied') / len(data['per_chat']) * 100) or 0:.1f}%
+- **Total Successful Conversations**: {solved_total:,}
+- **Success Rate**: {solve_rate:.1f}%
+- **User Satisfaction Rate**: {satisfaction_rate:.1f}%
 
 ### What This Means
 - **Success cases** are documented for reporting and understanding strengths
@@ -652,19 +777,20 @@ def generate_executive_report(analysis_dir, output_file):
 ---
 
 ## 📁 Data Sources
-This report is based on analysis of {len(data.get('per_chat', [])):,} chatbot conversations.
+This report is based on analysis of {total_chats:,} chatbot conversations.
 Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## 📊 Key Insights Summary
-1. **Success Rate**: {data.get('per_chat', []) and (sum(1 for r in data['per_chat'] if r.get('solved', False)) / len(data['per_chat']) * 100) or 0:.1f}%
-2. **Top Problem**: {data.get('per_chat', []) and Counter([r.get('failure_category', 'unknown') for r in data['per_chat']]).most_common(1)[0][0] or 'Unknown'}
-3. **User Satisfaction**: {data.get('per_chat', []) and (sum(1 for r in data['per_chat'] if r.get('user_emotion') == 'satisfied') / len(data['per_chat']) * 100) or 0:.1f}%
+1. **Success Rate**: {solve_rate:.1f}%
+2. **Top Problem**: {top_problem}
+3. **User Satisfaction**: {satisfaction_rate:.1f}%
 4. **Improvement Priority**: Focus on features affecting 10+ conversations first
-"""
+""",
+    ]
     
     # Write report
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(full_report)
+        f.writelines(report_parts)
     
     print(f"✅ Executive report generated: {output_file}")
     print(f"📊 Report structure:")
@@ -676,81 +802,66 @@ Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
     print(f"   📊 Success statistics overview")
     print(f"\n💡 Focus on FAILURE ANALYSIS sections for development priorities!")
 
-def consolidate_similar_features(feature_name):
-    """Consolidate similar features into actionable problem categories."""
-    feature_lower = feature_name.lower()
-    
+# Ordered (category, keywords) table for consolidate_similar_features: the first category with a keyword hit wins
+FEATURE_CATEGORY_KEYWORDS = [
     # Account and verification issues (broad category)
-    if any(term in feature_lower for term in ['account', 'verification', 'permission', 'access', 'login', 'password', 'security']):
-        return 'account-access-verification'
-    
+    ('account-access-verification', ['account', 'verification', 'permission', 'access', 'login', 'password', 'security']),
     # Ad management and campaign issues (broad category)
-    if any(term in feature_lower for term in ['ad', 'campaign', 'event', 'approval', 'rejection', 'scheduling', 'pixel', 'tracking']):
-        return 'ad-campaign-management'
-    
+    ('ad-campaign-management', ['ad', 'campaign', 'event', 'approval', 'rejection', 'scheduling', 'pixel', 'tracking']),
     # API and system integration issues (broad category)
-    if any(term in feature_lower for term in ['api', 'system', 'integration', 'clickmagick', 'weebly', 'wix', 'everflow', 'third-party']):
-        return 'api-system-integration'
-    
+    ('api-system-integration', ['api', 'system', 'integration', 'clickmagick', 'weebly', 'wix', 'everflow', 'third-party']),
     # Live support and human assistance (broad category)
-    if any(term in feature_lower for term in ['live', 'agent', 'human', 'support', 'escalation', 'assistance']):
-        return 'live-support-escalation'
-    
+    ('live-support-escalation', ['live', 'agent', 'human', 'support', 'escalation', 'assistance']),
     # UI/UX and workflow improvements (broad category)
-    if any(term in feature_lower for term in ['ui', 'interface', 'workflow', 'form', 'desktop', 'navigation', 'user-experience']):
-        return 'ui-ux-workflow-improvements'
-    
+    ('ui-ux-workflow-improvements', ['ui', 'interface', 'workflow', 'form', 'desktop', 'navigation', 'user-experience']),
     # Document and billing system issues (broad category)
-    if any(term in feature_lower for term in ['invoice', 'billing', 'document', 'ticket', 'payment', 'refund', 'credit']):
-        return 'document-billing-payment'
-    
+    ('document-billing-payment', ['invoice', 'billing', 'document', 'ticket', 'payment', 'refund', 'credit']),
     # Technical troubleshooting and complex issues (broad category)
-    if any(term in feature_lower for term in ['technical', 'troubleshooting', 'complex', 'debug', 'error', 'issue', 'problem']):
-        return 'technical-troubleshooting'
-    
+    ('technical-troubleshooting', ['technical', 'troubleshooting', 'complex', 'debug', 'error', 'issue', 'problem']),
     # Information and guidance requests (broad category)
-    if any(term in feature_lower for term in ['information', 'guidance', 'instruction', 'help', 'how-to', 'explanation', 'clarification']):
-        return 'information-guidance-requests'
-    
+    ('information-guidance-requests', ['information', 'guidance', 'instruction', 'help', 'how-to', 'explanation', 'clarification']),
     # Policy and compliance questions (broad category)
-    if any(term in feature_lower for term in ['policy', 'compliance', 'terms', 'rules', 'guidelines', 'requirements']):
-        return 'policy-compliance-questions'
-    
+    ('policy-compliance-questions', ['policy', 'compliance', 'terms', 'rules', 'guidelines', 'requirements']),
     # Performance and optimization (broad category)
-    if any(term in feature_lower for term in ['performance', 'optimization', 'speed', 'efficiency', 'improvement', 'enhancement']):
-        return 'performance-optimization'
-    
+    ('performance-optimization', ['performance', 'optimization', 'speed', 'efficiency', 'improvement', 'enhancement']),
     # Data and analytics (broad category)
-    if any(term in feature_lower for term in ['data', 'analytics', 'reporting', 'metrics', 'statistics', 'insights']):
-        return 'data-analytics-reporting'
-    
+    ('data-analytics-reporting', ['data', 'analytics', 'reporting', 'metrics', 'statistics', 'insights']),
     # Customer service and support (broad category)
-    if any(term in feature_lower for term in ['customer', 'service', 'support', 'help', 'assistance', 'contact']):
-        return 'customer-service-support'
-    
+    ('customer-service-support', ['customer', 'service', 'support', 'help', 'assistance', 'contact']),
     # Platform and infrastructure (broad category)
-    if any(term in feature_lower for term in ['platform', 'infrastructure', 'server', 'hosting', 'deployment', 'scalability']):
-        return 'platform-infrastructure'
-    
+    ('platform-infrastructure', ['platform', 'infrastructure', 'server', 'hosting', 'deployment', 'scalability']),
     # Security and privacy (broad category)
-    if any(term in feature_lower for term in ['security', 'privacy', 'authentication', 'authorization', 'encryption', 'compliance']):
-        return 'security-privacy-compliance'
-    
+    ('security-privacy-compliance', ['security', 'privacy', 'authentication', 'authorization', 'encryption', 'compliance']),
     # Mobile and accessibility (broad category)
-    if any(term in feature_lower for term in ['mobile', 'app', 'accessibility', 'responsive', 'device', 'tablet']):
-        return 'mobile-accessibility'
-    
+    ('mobile-accessibility', ['mobile', 'app', 'accessibility', 'responsive', 'device', 'tablet']),
     # Content and media management (broad category)
-    if any(term in feature_lower for term in ['content', 'media', 'image', 'video', 'file', 'upload', 'download']):
-        return 'content-media-management'
-    
+    ('content-media-management', ['content', 'media', 'image', 'video', 'file', 'upload', 'download']),
     # Communication and notifications (broad category)
-    if any(term in feature_lower for term in ['communication', 'notification', 'email', 'message', 'alert', 'reminder']):
-        return 'communication-notifications'
-    
+    ('communication-notifications', ['communication', 'notification', 'email', 'message', 'alert', 'reminder']),
     # Search and discovery (broad category)
-    if any(term in feature_lower for term in ['search', 'discovery', 'find', 'locate', 'browse', 'explore']):
-        return 'search-discovery-navigation'
+    ('search-discovery-navigation', ['search', 'discovery', 'find', 'locate', 'browse', 'explore']),
+]
+
+def compile_first_hit_matcher(keyword_table):
+    """Compile an ordered (category, keywords) table into one regex of lookahead alternatives.
+    
+    Alternatives are tried in table order, so `match(text).lastindex - 1` is the index of the first
+    category with any keyword in `text`, same as checking `any(term in text ...)` category by category.
+    """
+    alternatives = [
+        '(?=.*?(?:%s))()' % '|'.join(re.escape(term) for term in terms)
+        for _, terms in keyword_table
+    ]
+    return re.compile('|'.join(alternatives), re.DOTALL)
+
+FEATURE_CATEGORY_MATCHER = compile_first_hit_matcher(FEATURE_CATEGORY_KEYWORDS)
+
+@lru_cache(maxsize=4096)
+def consolidate_similar_features(feature_name):
+    """Consolidate similar features into actionable problem categories (memoized, it is pure)."""
+    match = FEATURE_CATEGORY_MATCHER.match(feature_name.lower())
+    if match:
+        return FEATURE_CATEGORY_KEYWORDS[match.lastindex - 1][0]
     
     # Default fallback for very specific features
     return 'other-specific-features'
@@ -1070,10 +1181,41 @@ def validate_mapping_structure(consolidated_mapping):
     
     return all_valid
 
-def generate_concise_report(analysis_dir, output_file):
-    """Generate a concise executive report for quick reviews."""
-    print(f"📊 Loading analysis data from {analysis_dir}...")
-    data = load_analysis_data(analysis_dir)
+# The conversation viewer's CSV path: local copies read from the Bot_* export folder, Netlify from ./chat-data/
+LOCAL_CSV_PATH_JS = 'const csvPath = `Bot_714b4955-90a2-4693-9380-a28dffee2e3a_Year_2025_4a86f154be3a4925a510e33bdda399b3 (3)/${filename}`;'
+NETLIFY_CSV_PATH_JS = 'const csvPath = `./chat-data/${filename}`;'
+
+# Analysis labels are LLM output, so they are escaped before being spliced into HTML text or quoted attributes
+HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+def escape_html(text):
+    """Escape a label for HTML in one str.translate pass (same output as html.escape)."""
+    return str(text).translate(HTML_ESCAPE_TABLE)
+
+# Key strengths are ranked by importance, not count (lower number = higher priority; unlisted capabilities get 99)
+KEY_CAPABILITY_PRIORITY = {
+    'bot-handled-perfectly': 1,  # Most important - shows overall success
+    'account-verification-guidance': 2,  # Core business function
+    'campaign-activation-instructions': 3,  # Core business function  
+    'policy-clarification': 4,  # Important for compliance
+    'multi-step-instruction': 5,  # Shows complexity handling
+    'problem-solving': 6,  # General capability
+}
+# Concise, meaningful display names for the key strengths (others are title-cased)
+KEY_CAPABILITY_DISPLAY_NAMES = {
+    'bot-handled-perfectly': 'Perfect Problem Resolution',
+    'account-verification-guidance': 'Account Verification Support',
+    'campaign-activation-instructions': 'Campaign Setup Guidance',
+    'policy-clarification': 'Policy & Rules Clarification',
+    'multi-step-instruction': 'Complex Multi-Step Tasks',
+    'problem-solving': 'General Problem Solving'
+}
+
+def generate_concise_report(analysis_dir, output_file, data=None):
+    """Generate a concise executive report for quick reviews (pass `data` to reuse an already loaded analysis)."""
+    if data is None:
+        print(f"📊 Loading analysis data from {analysis_dir}...")
+        data = load_analysis_data(analysis_dir)
     
     if not data:
         print("❌ No analysis data found!")
@@ -1092,27 +1234,21 @@ def generate_concise_report(analysis_dir, output_file):
         print(f"  ⚠️  Could not count raw CSV files: {e}")
         raw_csv_count = 0
     
-    results = data['per_chat']
-    analyzed_count = len(results)
-    
-    # Count conversation quality
-    high_value = sum(1 for r in results if r.get('conversation_quality') == 'high-value')
-    low_value = sum(1 for r in results if r.get('conversation_quality') == 'low-value')
-    error_conversations = sum(1 for r in results if r.get('conversation_quality') == 'error')
+    df = per_chat_frame(data)
+    analyzed_count = len(df)
     
-    # Filter to only high-value conversations for analysis
-    high_value_results = [r for r in results if r.get('conversation_quality') == 'high-value']
+    # Boolean masks over the per-chat frame, computed once; the metrics only count high-value conversations
+    high_value_mask = _column_or(df, 'conversation_quality', None).eq('high-value')
+    solved_mask = _column_or(df, 'solved', False).astype(bool)
+    needs_human_mask = _column_or(df, 'needs_human', False).astype(bool)
     
-    solved = sum(1 for r in high_value_results if r.get('solved', False))
-    needs_human = sum(1 for r in high_value_results if r.get('needs_human', False))
-    
-    # Calculate other issues (high-value conversations that weren't solved and don't need human)
-    other_issues = high_value - solved - needs_human
+    solved = int((high_value_mask & solved_mask).sum())
+    needs_human = int((high_value_mask & needs_human_mask).sum())
     
     # Calculate filtered out (raw CSVs that weren't analyzed)
     filtered_out = raw_csv_count - analyzed_count if raw_csv_count > 0 else 0
     
-    html_report = """<!DOCTYPE html>
+    html_parts = ["""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -1631,7 +1767,7 @@ def generate_concise_report(analysis_dir, output_file):
     <div class="container">
         <div class="header">
             <h1>🤖 Customer Service Chatbot Report</h1>
-            <p>Executive Summary - """ + pd.Timestamp.now().strftime('%B %d, %Y') + """</p>
+            <p>Executive Summary - """, pd.Timestamp.now().strftime('%B %d, %Y'), """</p>
         </div>
         
         <div class="content">
@@ -1648,23 +1784,23 @@ def generate_concise_report(analysis_dir, output_file):
                 <h2>📊 Key Metrics</h2>
                 <div class="metrics-grid">
                     <div class="metric-card" data-metric="totalCount">
-                        <div class="metric-number">""" + f"{raw_csv_count:,}" + """</div>
+                        <div class="metric-number">""", f"{raw_csv_count:,}", """</div>
                         <div class="metric-label">Total conversations</div>
                     </div>
                     <div class="metric-card" data-metric="analyzedCount">
-                        <div class="metric-number">""" + f"{analyzed_count:,}" + """</div>
+                        <div class="metric-number">""", f"{analyzed_count:,}", """</div>
                         <div class="metric-label">Analyzed</div>
                     </div>
                     <div class="metric-card" data-metric="solvedCount">
-                        <div class="metric-number">""" + f"{solved:,}" + """</div>
+                        <div class="metric-number">""", f"{solved:,}", """</div>
                         <div class="metric-label">Chatbot successes</div>
                     </div>
                     <div class="metric-card" data-metric="needsHumanCount">
-                        <div class="metric-number">""" + f"{needs_human:,}" + """</div>
+                        <div class="metric-number">""", f"{needs_human:,}", """</div>
                         <div class="metric-label">Need Human Assistance</div>
                     </div>
                     <div class="metric-card" data-metric="filteredCount">
-                        <div class="metric-number">""" + f"{filtered_out:,}" + """</div>
+                        <div class="metric-number">""", f"{filtered_out:,}", """</div>
                         <div class="metric-label">Filtered Out (Too Short/Greetings)</div>
                     </div>
                 </div>
@@ -1675,7 +1811,7 @@ def generate_concise_report(analysis_dir, output_file):
             <div class="section">
                 <h2>🚨 PROBLEMS THE CHATBOT CANNOT SOLVE</h2>
                 
-                <div class="issue-list">"""
+                <div class="issue-list">"""]
     
     # Check if we have grouped problems from the analysis
     if 'grouped_problems' in data.get('problem_mapping', {}) and data['problem_mapping']['grouped_problems']:
@@ -1691,18 +1827,18 @@ def generate_concise_report(analysis_dir, output_file):
             category_data = grouped_problems[category]
             
             # Create category header
-            html_report += f"""
+            html_parts.append(f"""
                 <div class="category-header" style="background: #e9ecef; padding: 12px 15px; margin: 20px 0 10px 0; border-radius: 6px; border-left: 4px solid #6c757d; font-weight: bold; color: #495057; font-size: 1.1em;">
                     <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <span>{category}</span>
+                        <span>{escape_html(category)}</span>
                         <span style="background: #6c757d; color: white; padding: 4px 8px; border-radius: 12px; font-size: 0.8em;">
                             {category_data['total_conversations']} conversations
                         </span>
                 </div>
                     <div style="font-size: 0.9em; font-weight: normal; margin-top: 5px; color: #6c757d;">
-                        {category_data['summary']}
+                        {escape_html(category_data['summary'])}
                     </div>
-                </div>"""
+                </div>""")
             
             # Display problems in this category
             problems = list(category_data['problems'].items())
@@ -1714,12 +1850,12 @@ def generate_concise_report(analysis_dir, output_file):
                 popup_json = json.dumps(problem_data, ensure_ascii=False)
                 popup_data = urllib.parse.quote(popup_json)
                 
-                html_report += f"""
-                <div class="feature-item clickable-item" data-problem="{problem}" data-popup="{popup_data}" data-count="{count}" style="margin-left: 20px;">
+                html_parts.append(f"""
+                <div class="feature-item clickable-item" data-problem="{escape_html(problem)}" data-popup="{popup_data}" data-count="{count}" style="margin-left: 20px;">
                     <span class="feature-count">{count:,}</span>
-                    <strong>{problem}</strong>
+                    <strong>{escape_html(problem)}</strong>
                     <div class="conversation-preview">Click to see {count} conversations</div>
-                    </div>"""
+                    </div>""")
     
     else:
         # Fallback to old method if no grouped problems
@@ -1730,11 +1866,11 @@ def generate_concise_report(analysis_dir, output_file):
                     count = len(problem_data['conversations'])
                     all_problems.append((problem, count, problem_data))
         
-        # Sort by count (most frequent problems first)
-        all_problems.sort(key=lambda x: x[1], reverse=True)
+        # Top 15 problems by count (most frequent first); nlargest keeps ties in mapping order like a stable sort
+        top_problems = heapq.nlargest(15, all_problems, key=itemgetter(1))
         
-        if all_problems:
-            for problem, count, problem_data in all_problems[:15]:  # Top 15 problems
+        if top_problems:
+            for problem, count, problem_data in top_problems:
                 # Verify count consistency
                 sub_problem_total = sum(len(convs) for convs in problem_data.get('sub_problems', {}).values())
                 if count != sub_problem_total:
@@ -1743,38 +1879,30 @@ def generate_concise_report(analysis_dir, output_file):
                 # Encode JSON for safe embedding in data- attribute
                 popup_json = json.dumps(problem_data, ensure_ascii=False)
                 popup_data = urllib.parse.quote(popup_json)
-                html_report += f"""
-                    <div class="feature-item clickable-item" data-problem="{problem}" data-popup="{popup_data}" data-count="{count}">
+                html_parts.append(f"""
+                    <div class="feature-item clickable-item" data-problem="{escape_html(problem)}" data-popup="{popup_data}" data-count="{count}">
                         <span class="feature-count">{count:,}</span>
-                        <strong>{problem}</strong>
+                        <strong>{escape_html(problem)}</strong>
                         <div class="conversation-preview">Click to see {count} conversations grouped by sub-problems (total: {sub_problem_total})</div>
-                    </div>"""
+                    </div>""")
     
-    html_report += """
+    html_parts.append("""
                 </div>
             </div>
 
             <div class="section">
                 <h2>✅ KEY CHATBOT STRENGTHS</h2>
                 
-                <div class="issue-list">"""
+                <div class="issue-list">""")
     
     # Create a prioritized list of key capabilities (ranked by importance, not count)
     key_capabilities = []
-    capability_priority = {
-        'bot-handled-perfectly': 1,  # Most important - shows overall success
-        'account-verification-guidance': 2,  # Core business function
-        'campaign-activation-instructions': 3,  # Core business function  
-        'policy-clarification': 4,  # Important for compliance
-        'multi-step-instruction': 5,  # Shows complexity handling
-        'problem-solving': 6,  # General capability
-    }
     
     if 'successful_capabilities' in data['problem_mapping'] and data['problem_mapping']['successful_capabilities']:
         # Collect and prioritize capabilities
         for capability, conversations in data['problem_mapping']['successful_capabilities'].items():
             if capability and conversations:
-                priority = capability_priority.get(capability, 99)  # Default low priority
+                priority = KEY_CAPABILITY_PRIORITY.get(capability, 99)  # Default low priority
                 key_capabilities.append((priority, capability, conversations))
         
         # Sort by priority (lower number = higher priority)
@@ -1790,35 +1918,25 @@ def generate_concise_report(analysis_dir, output_file):
             }
             popup_json = urllib.parse.quote(json.dumps(popup_data))
             
-            # Create concise, meaningful display names
-            display_names = {
-                'bot-handled-perfectly': 'Perfect Problem Resolution',
-                'account-verification-guidance': 'Account Verification Support',
-                'campaign-activation-instructions': 'Campaign Setup Guidance',
-                'policy-clarification': 'Policy & Rules Clarification',
-                'multi-step-instruction': 'Complex Multi-Step Tasks',
-                'problem-solving': 'General Problem Solving'
-            }
-            
-            display_name = display_names.get(capability, capability.replace('-', ' ').title())
+            display_name = KEY_CAPABILITY_DISPLAY_NAMES.get(capability, capability.replace('-', ' ').title())
             
-            html_report += f"""
-                <div class="feature-item clickable-item" data-problem="{capability}" data-popup="{popup_json}" data-count="{len(conversations)}">
+            html_parts.append(f"""
+                <div class="feature-item clickable-item" data-problem="{escape_html(capability)}" data-popup="{popup_json}" data-count="{len(conversations)}">
                     <span class="feature-count">✓</span>
-                    <strong>{display_name}</strong>
+                    <strong>{escape_html(display_name)}</strong>
                     <div class="conversation-preview">Proven capability - {len(conversations)} examples</div>
-                    </div>"""
+                    </div>""")
     
     # If no successes found
     if not key_capabilities:
-            html_report += """
+            html_parts.append("""
                     <div class="feature-item">
                     <span class="feature-count">⚠️</span>
                     <strong>Limited Success Data</strong>
                     <div class="conversation-preview">Few conversations were marked as successfully handled</div>
-                    </div>"""
+                    </div>""")
     
-    html_report += """
+    html_parts.extend(("""
                 </div>
                 </div>
 
@@ -1852,7 +1970,7 @@ def generate_concise_report(analysis_dir, output_file):
     
     <!-- Embedded Weekly Data -->
     <script>
-        window.embeddedWeeklyData = """ + json.dumps(data.get('weekly_data', {}), ensure_ascii=False) + """;
+        window.embeddedWeeklyData = """, json.dumps(data.get('weekly_data', {}), ensure_ascii=False), """;
     </script>
     
     <script>
@@ -2615,26 +2733,23 @@ def generate_concise_report(analysis_dir, output_file):
         }
     </script>
 </body>
-</html>"""
+</html>"""))
     
     # Write HTML report for local testing (with Bot_* folder path)
     local_output = output_file.replace('.html', '_local.html')
-    with open(local_output, 'w', encoding='utf-8') as f:
-        f.write(html_report)
     
-    # Write HTML report directly to Netlify deployment folder
+    # ...and directly to the Netlify deployment folder
     netlify_dir = './netlify-deploy'
     if not os.path.exists(netlify_dir):
         os.makedirs(netlify_dir)
         print(f"  📁 Created directory: {netlify_dir}")
-    
     netlify_output = os.path.join(netlify_dir, 'index.html')
-    netlify_html = html_report.replace(
-        'const csvPath = `Bot_714b4955-90a2-4693-9380-a28dffee2e3a_Year_2025_4a86f154be3a4925a510e33bdda399b3 (3)/${filename}`;',
-        'const csvPath = `./chat-data/${filename}`;'
-    )
-    with open(netlify_output, 'w', encoding='utf-8') as f:
-        f.write(netlify_html)
+    
+    # Stream the parts into both files instead of joining the whole page first; only the Netlify copy gets its CSV path rewritten
+    with open(local_output, 'w', encoding='utf-8') as local_file, open(netlify_output, 'w', encoding='utf-8') as netlify_file:
+        for part in html_parts:
+            local_file.write(part)
+            netlify_file.write(part.replace(LOCAL_CSV_PATH_JS, NETLIFY_CSV_PATH_JS))
     
     print(f"✅ Generated HTML reports:")
     print(f"   📁 Local testing: {local_output} (CSV path: ./Bot_*/)")
@@ -2663,16 +2778,16 @@ def generate_technical_analysis(data):
         if not api_df.empty:
             technical_analysis.append("### 🔌 API Integration Requirements")
             technical_analysis.append("")
-            for _, row in api_df.head(5).iterrows():
-                requirement = row['api_integration']
-                count = row['count']
+            top_api_df = api_df.head(5)
+            for requirement, count in zip(top_api_df['api_integration'], top_api_df['count']):
                 technical_analysis.append(f"- **{requirement}** - {count} conversations need this")
+                requirement_lower = requirement.lower()
                 # Extract specific technical details
-                if 'api' in requirement.lower():
+                if 'api' in requirement_lower:
                     technical_analysis.append(f"  - **Technical Need**: REST API endpoint development")
-                if 'integrate' in requirement.lower():
+                if 'integrate' in requirement_lower:
                     technical_analysis.append(f"  - **Technical Need**: System integration layer")
-                if 'database' in requirement.lower():
+                if 'database' in requirement_lower:
                     technical_analysis.append(f"  - **Technical Need**: Database access layer")
                 technical_analysis.append("")
     
@@ -2682,16 +2797,16 @@ def generate_technical_analysis(data):
         if not ui_df.empty:
             technical_analysis.append("### 🎨 UI/Workflow Requirements")
             technical_analysis.append("")
-            for _, row in ui_df.head(5).iterrows():
-                requirement = row['ui_workflow']
-                count = row['count']
+            top_ui_df = ui_df.head(5)
+            for requirement, count in zip(top_ui_df['ui_workflow'], top_ui_df['count']):
                 technical_analysis.append(f"- **{requirement}** - {count} conversations need this")
+                requirement_lower = requirement.lower()
                 # Extract specific UI details
-                if 'workflow' in requirement.lower():
+                if 'workflow' in requirement_lower:
                     technical_analysis.append(f"  - **UI Need**: Multi-step form workflow")
-                if 'button' in requirement.lower():
+                if 'button' in requirement_lower:
                     technical_analysis.append(f"  - **UI Need**: Interactive button elements")
-                if 'form' in requirement.lower():
+                if 'form' in requirement_lower:
                     technical_analysis.append(f"  - **UI Need**: Form validation and submission")
                 technical_analysis.append("")
     
@@ -2701,16 +2816,16 @@ def generate_technical_analysis(data):
         if not doc_df.empty:
             technical_analysis.append("### 📚 Documentation & Knowledge Gaps")
             technical_analysis.append("")
-            for _, row in doc_df.head(5).iterrows():
-                gap = row['documentation_gap']
-                count = row['count']
+            top_doc_df = doc_df.head(5)
+            for gap, count in zip(top_doc_df['documentation_gap'], top_doc_df['count']):
                 technical_analysis.append(f"- **{gap}** - {count} conversations need this")
+                gap_lower = gap.lower()
                 # Extract specific documentation needs
-                if 'guide' in gap.lower():
+                if 'guide' in gap_lower:
                     technical_analysis.append(f"  - **Content Need**: Step-by-step user guide")
-                if 'instruction' in gap.lower():
+                if 'instruction' in gap_lower:
                     technical_analysis.append(f"  - **Content Need**: Clear instruction manual")
-                if 'knowledge' in gap.lower():
+                if 'knowledge' in gap_lower:
                     technical_analysis.append(f"  - **Content Need**: Knowledge base article")
                 technical_analysis.append("")
     
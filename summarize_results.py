@@ -1,29 +1,68 @@
 #!/usr/bin/env python3
 import os
+import io
 import json
+import numpy as np
 import pandas as pd
+import zstandard as zstd
 import re
 from collections import Counter, defaultdict
+from pathlib import Path
 import argparse
 
+# orjson parses the per-chat JSONL several times faster; fall back to the stdlib parser when it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+def _load_json_line(line):
+    """Parse one JSONL line (bytes); NaN/Infinity or oversized ints are only accepted by the stdlib parser."""
+    try:
+        return _json_loads(line)
+    except ValueError:
+        return json.loads(line)
+
+def iter_per_chat(analysis_dir, fields=None):
+    """Yield per-chat records, preferring per_chat.jsonl.zst over a plain per_chat.jsonl.
+    
+    If `fields` is given, each record keeps only those keys, so callers that need a few columns
+    don't hold the long free-text fields (examples, conversation_flow, ...) in memory.
+    """
+    zst_path = os.path.join(analysis_dir, "per_chat.jsonl.zst")
+    plain_path = os.path.join(analysis_dir, "per_chat.jsonl")
+    
+    # Lines are read as bytes and handed to the parser undecoded
+    if os.path.exists(zst_path):
+        raw = open(zst_path, 'rb')
+        lines = io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw), buffer_size=1 << 20)
+    elif os.path.exists(plain_path):
+        lines = open(plain_path, 'rb', buffering=1 << 20)
+    else:
+        return
+    
+    with lines:
+        for line in lines:
+            if line.strip():
+                record = _load_json_line(line)
+                if fields is not None:
+                    record = {k: record[k] for k in fields if k in record}
+                yield record
+
 def load_analysis_results(analysis_dir):
     """Load all analysis results from the analysis directory."""
     results = {}
     
-    # Load per_chat.jsonl
-    per_chat_path = os.path.join(analysis_dir, "per_chat.jsonl")
-    if os.path.exists(per_chat_path):
-        with open(per_chat_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    results[data['file']] = data
+    # Load per_chat.jsonl.zst (or a legacy uncompressed per_chat.jsonl)
+    for data in iter_per_chat(analysis_dir):
+        results[data['file']] = data
     
     # Load summary.csv as backup
     summary_path = os.path.join(analysis_dir, "summary.csv")
     if os.path.exists(summary_path) and not results:
         df = pd.read_csv(summary_path)
-        for _, row in df.iterrows():
+        for row in df.to_dict('records'):
             results[row['file']] = {
                 'file': row['file'],
                 'topics': row['topics'].split(',') if pd.notna(row['topics']) else [],
@@ -152,34 +191,17 @@ def categorize_failure_reasons(reasons):
     
     return categorized
 
-def analyze_other_category(results):
-    """Analyze what's actually in the 'other' category to break it down."""
-    other_failures = []
-    other_tasks = []
+def analyze_other_category(df):
+    """Analyze what's actually in the 'other' category to break it down.
     
-    # Handle both dict and list formats
-    if isinstance(results, dict):
-        results_list = list(results.values())
-    else:
-        results_list = results
-    
-    for result in results_list:
-        # Analyze failure categories marked as "other"
-        if result.get('failure_category') == 'other':
-            why_unsolved = result.get('why_unsolved', [])
-            for reason in why_unsolved:
-                if reason and reason != 'none':
-                    other_failures.append(reason.lower())
-        
-        # Analyze user tasks marked as "other"
-        user_tasks = result.get('user_tasks_attempted', [])
-        for task in user_tasks:
-            if task and task != 'none':
-                other_tasks.append(task.lower())
+    Takes the per-chat frame built by generate_summary_report, so each field is read as one column.
+    """
+    # Analyze failure categories marked as "other"
+    is_other = _column(df, 'failure_category').eq('other')
+    failure_counts = _count_list_items(_column(df, 'why_unsolved')[is_other], skip=('', 'none'), label_for=str.lower)
     
-    # Count and categorize the "other" items
-    failure_counts = Counter(other_failures)
-    task_counts = Counter(other_tasks)
+    # Analyze user tasks marked as "other"
+    task_counts = _count_list_items(_column(df, 'user_tasks_attempted'), skip=('', 'none'), label_for=str.lower)
     
     return failure_counts, task_counts
 
@@ -285,134 +307,158 @@ def categorize_user_tasks(tasks):
     
     return categorized
 
+def classify_escalation_trigger(trigger):
+    """Fold the different "no escalation happened" answers into two buckets."""
+    trigger_lower = trigger.lower()
+    if any(phrase in trigger_lower for phrase in ['no-escalation', 'bot-solved', 'user-satisfied', 'conversation-completed']):
+        return 'no-escalation-needed-successful'
+    if any(phrase in trigger_lower for phrase in ['user-abandoned', 'conversation-abandoned']):
+        return 'no-escalation-needed-abandoned'
+    return trigger
+
+def classify_error_pattern(error):
+    """Fold the different "no errors" answers into two buckets."""
+    error_lower = error.lower()
+    if any(phrase in error_lower for phrase in ['no-errors', 'system-functioning', 'all-requests-successful', 'no-technical']):
+        return 'no-errors-detected-successful'
+    if any(phrase in error_lower for phrase in ['conversation-abandoned', 'user-abandoned']):
+        return 'no-errors-detected-abandoned'
+    return error
+
+def classify_improvement_need(improvement):
+    """Fold the different "no improvement needed" answers into a few buckets."""
+    if not improvement or improvement == 'no-improvement-needed':
+        return 'no-improvement-needed'
+    improvement_lower = improvement.lower()
+    if any(phrase in improvement_lower for phrase in ['no-improvement', 'bot-handled', 'user-request-fulfilled', 'conversation-successful']):
+        return 'no-improvement-needed-successful'
+    if any(phrase in improvement_lower for phrase in ['user-abandoned', 'conversation-abandoned']):
+        return 'no-improvement-needed-abandoned'
+    return improvement
+
+def _column(df, name):
+    """Return a column of the per-chat frame, or an all-missing column if no record has that field."""
+    if name in df:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+def _flag(df, name):
+    """Return a yes/no field as a boolean column, missing values counting as False.
+    
+    Filled with where() rather than fillna(False), which warns about downcasting object columns on pandas 2.x.
+    """
+    column = _column(df, name)
+    return column.where(column.notna(), False).astype(bool)
+
+def _count_values(values):
+    """Count a Series into a Counter, keeping first-seen order for ties (like incremental counting)."""
+    return Counter({k: int(v) for k, v in values.value_counts(sort=False).items()})
+
+# Stands in for rows with a missing or empty list when those are counted under an `empty_label`
+_EMPTY_ROW = object()
+
+def _count_list_items(col, skip=('',), label_for=None, empty_label=None):
+    """Count the items of a list-valued column in one vectorized pass.
+    
+    Missing items and items in `skip` are ignored, `label_for` is applied once per distinct item,
+    and rows whose list is missing or empty are counted under `empty_label` when one is given.
+    """
+    items = col.explode()
+    if empty_label is not None:
+        has_items = col.map(lambda v: isinstance(v, list) and len(v) > 0)
+        items = items.where(has_items.reindex(items.index).to_numpy(), _EMPTY_ROW)
+    # Dictionary-encode the items once (codes in first-seen order) and count the integer codes,
+    # so labels are only resolved per distinct item; labels still come out in first-seen order
+    codes, uniques = pd.factorize(items)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    tally = Counter()
+    for item, count in zip(uniques, counts.tolist()):
+        if item is _EMPTY_ROW:
+            tally[empty_label] += count
+        elif item not in skip:
+            label = label_for(item) if label_for else item
+            if pd.notna(label):
+                tally[label] += count
+    return tally
+
+def dump_counter(ranked, key_col, path, **columns):
+    """Write `(key, count)` pairs (as returned by `Counter.most_common()`) to CSV as `key_col,count[,...]`.
+    
+    Extra columns are computed from the count Series, e.g. `percentage=lambda c: (c/total)*100`.
+    """
+    counts = pd.Series(dict(ranked), name='count', dtype='int64')
+    counts.index.name = key_col
+    frame = counts.to_frame()
+    for name, compute in columns.items():
+        frame[name] = compute(counts)
+    frame.to_csv(path)
+
+def _percent_lines(items, total, suffix=''):
+    """Format `(key, count)` pairs as markdown bullets with their share of `total`."""
+    return [f"- **{key}**: {count} conversations ({(count / total) * 100:.1f}%{suffix})\n" for key, count in items]
+
 def generate_summary_report(results, output_dir):
     """Generate comprehensive summary reports."""
     if not results:
         print("❌ No results to summarize!")
         return
     
-    print(f"📊 Summarizing {len(results)} conversation results...")
+    # Handle both dict and list formats
+    if isinstance(results, dict):
+        records = list(results.values())
+    else:
+        records = list(results)
+    
+    print(f"📊 Summarizing {len(records)} conversation results...")
+    out = Path(output_dir)
+    
+    # Materialize the records once as columns; every counter below is a vectorized pass over one column
+    df = pd.DataFrame(records)
+    solved = _flag(df, 'solved')
+    solved_df = df[solved]
+    
+    # Categorize each distinct failure reason / user task once
+    failure_reasons = _column(df, 'why_unsolved').explode().dropna()
+    unique_reasons = list(failure_reasons.unique())
+    user_tasks = _column(df, 'user_tasks_attempted').explode().dropna()
+    unique_tasks = list(user_tasks.unique())
+    
+    failure_cats = _column(df, 'failure_category').dropna()
+    feature_cats = _column(df, 'feature_category').dropna()
+    improvements = _column(df, 'improvement_needed').fillna('')
     
-    # Initialize counters
     summary_stats = {
-        'total_conversations': len(results),
-        'solved_conversations': 0,
-        'needs_human': 0,
-        'failure_categories': Counter(),
-        'feature_categories': Counter(),
-        'topics': Counter(),
-        'categorized_failures': Counter(),
-        'categorized_tasks': Counter(),
-        'improvement_needs': Counter(),
-        'escalation_triggers': Counter(),
-        'error_patterns': Counter(),
-        'successful_topics': Counter(),
-        'successful_tasks': Counter(),
-        'capabilities': Counter(),
-        'success_patterns': Counter()
+        'total_conversations': len(records),
+        'solved_conversations': int(solved.sum()),
+        'needs_human': int(_flag(df, 'needs_human').sum()),
+        'failure_categories': _count_values(failure_cats[(failure_cats != '') & (failure_cats != 'unknown')]),
+        'feature_categories': _count_values(feature_cats[(feature_cats != '') & (feature_cats != 'none')]),
+        'topics': _count_list_items(_column(df, 'topics'), skip=('', 'unknown')),
+        'categorized_failures': _count_values(failure_reasons.map(dict(zip(unique_reasons, categorize_failure_reasons(unique_reasons))))),
+        'categorized_tasks': _count_values(user_tasks.map(dict(zip(unique_tasks, categorize_user_tasks(unique_tasks))))),
+        'improvement_needs': _count_values(improvements.map({v: classify_improvement_need(v) for v in improvements.unique()})),
+        # Escalation triggers / error patterns (avoid generic "none" responses)
+        'escalation_triggers': _count_list_items(_column(df, 'escalation_triggers'), skip=('', 'none'),
+                                                 label_for=classify_escalation_trigger,
+                                                 empty_label='no-escalation-triggers-provided'),
+        'error_patterns': _count_list_items(_column(df, 'error_patterns'), skip=('', 'none'),
+                                            label_for=classify_error_pattern,
+                                            empty_label='no-error-patterns-provided'),
+        # Analyze successful conversations
+        'successful_topics': _count_list_items(_column(solved_df, 'topics'), skip=('', 'unknown')),
+        'successful_tasks': _count_list_items(_column(solved_df, 'user_tasks_attempted')),
+        'capabilities': _count_list_items(_column(solved_df, 'capabilities')),
+        'success_patterns': Counter(
+            pattern
+            for file_data, is_solved in zip(records, solved)
+            if is_solved
+            for pattern in identify_success_patterns(file_data)
+        )
     }
     
-    # Process each result
-    for file_data in results.values():
-        # Basic stats
-        if file_data.get('solved', False):
-            summary_stats['solved_conversations'] += 1
-        
-        if file_data.get('needs_human', False):
-            summary_stats['needs_human'] += 1
-        
-        # Count topics
-        for topic in file_data.get('topics', []):
-            if topic and topic != 'unknown':
-                summary_stats['topics'][topic] += 1
-        
-        # Count failure categories
-        failure_cat = file_data.get('failure_category', 'unknown')
-        if failure_cat and failure_cat != 'unknown':
-            summary_stats['failure_categories'][failure_cat] += 1
-        
-        # Count feature categories
-        feature_cat = file_data.get('feature_category', 'none')
-        if feature_cat and feature_cat != 'none':
-            summary_stats['feature_categories'][feature_cat] += 1
-        
-        # Count escalation triggers (avoid generic "none" responses)
-        escalation_triggers = file_data.get('escalation_triggers', [])
-        if escalation_triggers:
-            for trigger in escalation_triggers:
-                if trigger and trigger != 'none':
-                    if any(phrase in trigger.lower() for phrase in ['no-escalation', 'bot-solved', 'user-satisfied', 'conversation-completed']):
-                        summary_stats['escalation_triggers']['no-escalation-needed-successful'] += 1
-                    elif any(phrase in trigger.lower() for phrase in ['user-abandoned', 'conversation-abandoned']):
-                        summary_stats['escalation_triggers']['no-escalation-needed-abandoned'] += 1
-                    else:
-                        summary_stats['escalation_triggers'][trigger] += 1
-        else:
-            # Handle cases where escalation_triggers is empty
-            summary_stats['escalation_triggers']['no-escalation-triggers-provided'] += 1
-        
-        # Count error patterns (avoid generic "none" responses)
-        error_patterns = file_data.get('error_patterns', [])
-        if error_patterns:
-            for error in error_patterns:
-                if error and error != 'none':
-                    if any(phrase in error.lower() for phrase in ['no-errors', 'system-functioning', 'all-requests-successful', 'no-technical']):
-                        summary_stats['error_patterns']['no-errors-detected-successful'] += 1
-                    elif any(phrase in error.lower() for phrase in ['conversation-abandoned', 'user-abandoned']):
-                        summary_stats['error_patterns']['no-errors-detected-abandoned'] += 1
-                    else:
-                        summary_stats['error_patterns'][error] += 1
-        else:
-            # Handle cases where error_patterns is empty
-            summary_stats['error_patterns']['no-error-patterns-provided'] += 1
-        
-        # Categorize failure reasons
-        failure_reasons = file_data.get('why_unsolved', [])
-        categorized_failures = categorize_failure_reasons(failure_reasons)
-        for failure in categorized_failures:
-            summary_stats['categorized_failures'][failure] += 1
-        
-        # Categorize user tasks
-        user_tasks = file_data.get('user_tasks_attempted', [])
-        categorized_tasks = categorize_user_tasks(user_tasks)
-        for task in categorized_tasks:
-            summary_stats['categorized_tasks'][task] += 1
-        
-        # Count improvement needs
-        improvement = file_data.get('improvement_needed', 'no-improvement-needed')
-        if improvement and improvement != 'no-improvement-needed':
-            # Categorize improvement needs to avoid generic responses
-            if any(phrase in improvement.lower() for phrase in ['no-improvement', 'bot-handled', 'user-request-fulfilled', 'conversation-successful']):
-                summary_stats['improvement_needs']['no-improvement-needed-successful'] += 1
-            elif any(phrase in improvement.lower() for phrase in ['user-abandoned', 'conversation-abandoned']):
-                summary_stats['improvement_needs']['no-improvement-needed-abandoned'] += 1
-            else:
-                summary_stats['improvement_needs'][improvement] += 1
-        else:
-            # Handle cases where improvement is marked as no-improvement-needed
-            summary_stats['improvement_needs']['no-improvement-needed'] += 1
-        
-        # Analyze successful conversations
-        if file_data.get('solved', False):
-            # What topics were successfully handled
-            for topic in file_data.get('topics', []):
-                if topic and topic != 'unknown':
-                    summary_stats['successful_topics'][topic] += 1
-            
-            # What tasks were successfully completed
-            for task in user_tasks:
-                if task:
-                    summary_stats['successful_tasks'][task] += 1
-            
-            # What capabilities were demonstrated
-            for capability in file_data.get('capabilities', []):
-                if capability:
-                    summary_stats['capabilities'][capability] += 1
-            
-            # Look for success patterns in the conversation
-            success_patterns = identify_success_patterns(file_data)
-            for pattern in success_patterns:
-                summary_stats['success_patterns'][pattern] += 1
+    # Sort every counter once; the CSVs, the summary table and the markdown all read from these
+    ranked = {name: stat.most_common() for name, stat in summary_stats.items() if isinstance(stat, Counter)}
+    top = lambda name: ranked[name][0][0] if ranked[name] else 'N/A'
     
     # Calculate percentages
     total = summary_stats['total_conversations']
@@ -437,103 +483,74 @@ def generate_summary_report(results, output_dir):
             summary_stats['solved_conversations'],
             f"{solve_rate:.1f}%",
             f"{human_rate:.1f}%",
-            summary_stats['failure_categories'].most_common(1)[0][0] if summary_stats['failure_categories'] else 'N/A',
-            summary_stats['feature_categories'].most_common(1)[0][0] if summary_stats['feature_categories'] else 'N/A',
-            summary_stats['topics'].most_common(1)[0][0] if summary_stats['topics'] else 'N/A',
-            summary_stats['categorized_failures'].most_common(1)[0][0] if summary_stats['categorized_failures'] else 'N/A',
-            summary_stats['categorized_tasks'].most_common(1)[0][0] if summary_stats['categorized_tasks'] else 'N/A'
+            top('failure_categories'),
+            top('feature_categories'),
+            top('topics'),
+            top('categorized_failures'),
+            top('categorized_tasks')
         ]
     }
     
     summary_df = pd.DataFrame(summary_data)
-    summary_csv_path = os.path.join(output_dir, "summary_report.csv")
+    summary_csv_path = out / "summary_report.csv"
     summary_df.to_csv(summary_csv_path, index=False)
     print(f"  ✅ Created summary report: {summary_csv_path}")
     
     # Generate categorized failures CSV
     if summary_stats['categorized_failures']:
-        failures_df = pd.DataFrame([
-            {'failure_category': k, 'count': v, 'percentage': (v/total)*100}
-            for k, v in summary_stats['categorized_failures'].most_common()
-        ])
-        failures_csv_path = os.path.join(output_dir, "categorized_failures.csv")
-        failures_df.to_csv(failures_csv_path, index=False)
+        failures_csv_path = out / "categorized_failures.csv"
+        dump_counter(ranked['categorized_failures'], 'failure_category', failures_csv_path, percentage=lambda c: (c/total)*100)
         print(f"  ✅ Created categorized failures: {failures_csv_path}")
     
     # Generate categorized tasks CSV
     if summary_stats['categorized_tasks']:
-        tasks_df = pd.DataFrame([
-            {'task_category': k, 'count': v, 'percentage': (v/total)*100}
-            for k, v in summary_stats['categorized_tasks'].most_common()
-        ])
-        tasks_csv_path = os.path.join(output_dir, "categorized_tasks.csv")
-        tasks_df.to_csv(tasks_csv_path, index=False)
+        tasks_csv_path = out / "categorized_tasks.csv"
+        dump_counter(ranked['categorized_tasks'], 'task_category', tasks_csv_path, percentage=lambda c: (c/total)*100)
         print(f"  ✅ Created categorized tasks: {tasks_csv_path}")
     
     # Generate improvement priorities CSV
     if summary_stats['improvement_needs']:
-        improvements_df = pd.DataFrame([
-            {'improvement': k, 'count': v, 'priority': 'High' if v >= 3 else 'Medium' if v >= 2 else 'Low'}
-            for k, v in summary_stats['improvement_needs'].most_common()
-        ])
-        improvements_csv_path = os.path.join(output_dir, "improvement_priorities.csv")
-        improvements_df.to_csv(improvements_csv_path, index=False)
+        improvements_csv_path = out / "improvement_priorities.csv"
+        dump_counter(ranked['improvement_needs'], 'improvement', improvements_csv_path,
+                     priority=lambda c: c.map(lambda v: 'High' if v >= 3 else 'Medium' if v >= 2 else 'Low'))
         print(f"  ✅ Created improvement priorities: {improvements_csv_path}")
     
     # Generate success analysis CSV
     if summary_stats['successful_topics']:
-        success_topics_df = pd.DataFrame([
-            {'successful_topic': k, 'count': v, 'percentage': (v/summary_stats['solved_conversations'])*100}
-            for k, v in summary_stats['successful_topics'].most_common()
-        ])
-        success_topics_csv_path = os.path.join(output_dir, "successful_topics.csv")
-        success_topics_df.to_csv(success_topics_csv_path, index=False)
+        success_topics_csv_path = out / "successful_topics.csv"
+        dump_counter(ranked['successful_topics'], 'successful_topic', success_topics_csv_path, percentage=lambda c: (c/summary_stats['solved_conversations'])*100)
         print(f"  ✅ Created successful topics: {success_topics_csv_path}")
     
     # Generate capabilities CSV
     if summary_stats['capabilities']:
-        capabilities_df = pd.DataFrame([
-            {'capability': k, 'count': v, 'percentage': (v/summary_stats['solved_conversations'])*100}
-            for k, v in summary_stats['capabilities'].most_common()
-        ])
-        capabilities_csv_path = os.path.join(output_dir, "capabilities.csv")
-        capabilities_df.to_csv(capabilities_csv_path, index=False)
+        capabilities_csv_path = out / "capabilities.csv"
+        dump_counter(ranked['capabilities'], 'capability', capabilities_csv_path, percentage=lambda c: (c/summary_stats['solved_conversations'])*100)
         print(f"  ✅ Created capabilities: {capabilities_csv_path}")
     
     # Generate success patterns CSV
     if summary_stats['success_patterns']:
-        patterns_df = pd.DataFrame([
-            {'success_pattern': k, 'count': v, 'percentage': (v/summary_stats['solved_conversations'])*100}
-            for k, v in summary_stats['success_patterns'].most_common()
-        ])
-        patterns_csv_path = os.path.join(output_dir, "success_patterns.csv")
-        patterns_df.to_csv(patterns_csv_path, index=False)
+        patterns_csv_path = out / "success_patterns.csv"
+        dump_counter(ranked['success_patterns'], 'success_pattern', patterns_csv_path, percentage=lambda c: (c/summary_stats['solved_conversations'])*100)
         print(f"  ✅ Created success patterns: {patterns_csv_path}")
     
     # Analyze what's in the "other" category
-    other_failure_counts, other_task_counts = analyze_other_category(results)
+    other_failure_counts, other_task_counts = analyze_other_category(df)
+    other_failures_ranked = other_failure_counts.most_common(20)
+    other_tasks_ranked = other_task_counts.most_common(20)
     
     # Generate "other" breakdown CSVs
     if other_failure_counts:
-        other_failures_df = pd.DataFrame([
-            {'other_failure_reason': k, 'count': v}
-            for k, v in other_failure_counts.most_common(20)
-        ])
-        other_failures_csv_path = os.path.join(output_dir, "other_failures_breakdown.csv")
-        other_failures_df.to_csv(other_failures_csv_path, index=False)
+        other_failures_csv_path = out / "other_failures_breakdown.csv"
+        dump_counter(other_failures_ranked, 'other_failure_reason', other_failures_csv_path)
         print(f"  ✅ Created other failures breakdown: {other_failures_csv_path}")
     
     if other_task_counts:
-        other_tasks_df = pd.DataFrame([
-            {'other_user_task': k, 'count': v}
-            for k, v in other_task_counts.most_common(20)
-        ])
-        other_tasks_csv_path = os.path.join(output_dir, "other_tasks_breakdown.csv")
-        other_tasks_df.to_csv(other_tasks_csv_path, index=False)
+        other_tasks_csv_path = out / "other_tasks_breakdown.csv"
+        dump_counter(other_tasks_ranked, 'other_user_task', other_tasks_csv_path)
         print(f"  ✅ Created other tasks breakdown: {other_tasks_csv_path}")
     
     # Generate markdown summary
-    markdown_content = f"""# Chatbot Analysis Summary Report
+    markdown = [f"""# Chatbot Analysis Summary Report
 
 ## 📊 Overall Statistics
 - **Total Conversations**: {total}
@@ -541,75 +558,59 @@ def generate_summary_report(results, output_dir):
 - **Needs Human**: {summary_stats['needs_human']} ({human_rate:.1f}%)
 
 ## 🚨 Top Failure Categories
-"""
-    
-    for category, count in summary_stats['failure_categories'].most_common(5):
-        percentage = (count / total) * 100
-        markdown_content += f"- **{category}**: {count} conversations ({percentage:.1f}%)\n"
-    
-    markdown_content += "\n## 🔧 Top Feature Categories\n"
-    for category, count in summary_stats['feature_categories'].most_common(5):
-        percentage = (count / total) * 100
-        markdown_content += f"- **{category}**: {count} conversations ({percentage:.1f}%)\n"
-    
-    markdown_content += "\n## 🏷️ Top Topics\n"
-    for topic, count in summary_stats['topics'].most_common(5):
-        percentage = (count / total) * 100
-        markdown_content += f"- **{topic}**: {count} conversations ({percentage:.1f}%)\n"
-    
-    markdown_content += "\n## ❌ Categorized Failure Reasons\n"
-    for failure, count in summary_stats['categorized_failures'].most_common():
-        percentage = (count / total) * 100
-        markdown_content += f"- **{failure}**: {count} conversations ({percentage:.1f}%)\n"
-    
-    markdown_content += "\n## 🎯 Categorized User Tasks\n"
-    for task, count in summary_stats['categorized_tasks'].most_common():
-        percentage = (count / total) * 100
-        markdown_content += f"- **{task}**: {count} conversations ({percentage:.1f}%)\n"
-    
-    markdown_content += "\n## 🚀 Improvement Priorities\n"
-    for improvement, count in summary_stats['improvement_needs'].most_common(5):
+"""]
+    
+    markdown += _percent_lines(ranked['failure_categories'][:5], total)
+    
+    markdown.append("\n## 🔧 Top Feature Categories\n")
+    markdown += _percent_lines(ranked['feature_categories'][:5], total)
+    
+    markdown.append("\n## 🏷️ Top Topics\n")
+    markdown += _percent_lines(ranked['topics'][:5], total)
+    
+    markdown.append("\n## ❌ Categorized Failure Reasons\n")
+    markdown += _percent_lines(ranked['categorized_failures'], total)
+    
+    markdown.append("\n## 🎯 Categorized User Tasks\n")
+    markdown += _percent_lines(ranked['categorized_tasks'], total)
+    
+    markdown.append("\n## 🚀 Improvement Priorities\n")
+    for improvement, count in ranked['improvement_needs'][:5]:
         priority = "High" if count >= 3 else "Medium" if count >= 2 else "Low"
-        markdown_content += f"- **{priority} Priority**: {improvement} ({count} conversations need this)\n"
+        markdown.append(f"- **{priority} Priority**: {improvement} ({count} conversations need this)\n")
     
     # Add "other" category breakdown
     if other_failure_counts:
-        markdown_content += "\n### 🔍 Breaking Down the 'Other' Category\n"
-        markdown_content += "**Top 'Other' Failure Reasons (need better categorization):**\n"
-        for reason, count in other_failure_counts.most_common(10):
-            markdown_content += f"- **{reason}**: {count} occurrences\n"
+        markdown.append("\n### 🔍 Breaking Down the 'Other' Category\n")
+        markdown.append("**Top 'Other' Failure Reasons (need better categorization):**\n")
+        for reason, count in other_failures_ranked[:10]:
+            markdown.append(f"- **{reason}**: {count} occurrences\n")
         
-        markdown_content += "\n**Recommendation**: These patterns should be added to the categorization system.\n"
+        markdown.append("\n**Recommendation**: These patterns should be added to the categorization system.\n")
     
     if other_task_counts:
-        markdown_content += "\n**Top 'Other' User Tasks (need better categorization):**\n"
-        for task, count in other_task_counts.most_common(10):
-            markdown_content += f"- **{task}**: {count} occurrences\n"
+        markdown.append("\n**Top 'Other' User Tasks (need better categorization):**\n")
+        for task, count in other_tasks_ranked[:10]:
+            markdown.append(f"- **{task}**: {count} occurrences\n")
         
-        markdown_content += "\n**Recommendation**: These task types should be added to the task categorization system.\n"
+        markdown.append("\n**Recommendation**: These task types should be added to the task categorization system.\n")
     
-    markdown_content += "\n## ✅ Success Analysis\n"
-    markdown_content += f"### What the Chatbot Does Well ({summary_stats['solved_conversations']} successful conversations)\n"
+    markdown.append("\n## ✅ Success Analysis\n")
+    markdown.append(f"### What the Chatbot Does Well ({summary_stats['solved_conversations']} successful conversations)\n")
     
     if summary_stats['successful_topics']:
-        markdown_content += "\n#### Top Successful Topics\n"
-        for topic, count in summary_stats['successful_topics'].most_common(5):
-            percentage = (count / summary_stats['solved_conversations']) * 100
-            markdown_content += f"- **{topic}**: {count} conversations ({percentage:.1f}% of successes)\n"
+        markdown.append("\n#### Top Successful Topics\n")
+        markdown += _percent_lines(ranked['successful_topics'][:5], summary_stats['solved_conversations'], ' of successes')
     
     if summary_stats['capabilities']:
-        markdown_content += "\n#### Demonstrated Capabilities\n"
-        for capability, count in summary_stats['capabilities'].most_common(5):
-            percentage = (count / summary_stats['solved_conversations']) * 100
-            markdown_content += f"- **{capability}**: {count} conversations ({percentage:.1f}% of successes)\n"
+        markdown.append("\n#### Demonstrated Capabilities\n")
+        markdown += _percent_lines(ranked['capabilities'][:5], summary_stats['solved_conversations'], ' of successes')
     
     if summary_stats['success_patterns']:
-        markdown_content += "\n#### Success Patterns\n"
-        for pattern, count in summary_stats['success_patterns'].most_common():
-            percentage = (count / summary_stats['solved_conversations']) * 100
-            markdown_content += f"- **{pattern}**: {count} conversations ({percentage:.1f}% of successes)\n"
+        markdown.append("\n#### Success Patterns\n")
+        markdown += _percent_lines(ranked['success_patterns'], summary_stats['solved_conversations'], ' of successes')
     
-    markdown_content += f"""
+    markdown.append(f"""
 
 ## 📁 Generated Files
 - `summary_report.csv` - High-level summary statistics
@@ -623,14 +624,15 @@ def generate_summary_report(results, output_dir):
 - `other_tasks_breakdown.csv` - Breakdown of "other" user tasks
 
 ## 💡 Key Insights
-1. **Most Common Issue**: {summary_stats['categorized_failures'].most_common(1)[0][0] if summary_stats['categorized_failures'] else 'N/A'}
-2. **Top User Need**: {summary_stats['categorized_tasks'].most_common(1)[0][0] if summary_stats['categorized_tasks'] else 'N/A'}
-3. **Priority Improvement**: {summary_stats['improvement_needs'].most_common(1)[0][0] if summary_stats['improvement_needs'] else 'N/A'}
-"""
+1. **Most Common Issue**: {top('categorized_failures')}
+2. **Top User Need**: {top('categorized_tasks')}
+3. **Priority Improvement**: {top('improvement_needs')}
+""")
     
-    markdown_path = os.path.join(output_dir, "summary_report.md")
+    # Write the fragments straight to the file instead of joining a second full copy of the report first
+    markdown_path = out / "summary_report.md"
     with open(markdown_path, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
+        f.writelines(markdown)
     print(f"  ✅ Created summary markdown: {markdown_path}")
     
     print(f"\n🎯 Summary complete! Check {output_dir} for all summary files.")
@@ -0,0 +1,79 @@
+"""Regression tests for analyze_chats (run with `python -m pytest` from the repo root)."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import analyze_chats as ac
+
+
+def test_transcript_skips_messages_pandas_reads_as_missing(tmp_path):
+    csv_path = tmp_path / 'chat.csv'
+    csv_path.write_text(
+        'Time,Sender Type,Message\n'
+        '2025-03-01 10:00:00.123,web,I need help with my ad\n'
+        '2025-03-01 10:00:05,bot,N/A\n'
+        '2025-03-01 10:00:06,bot,null\n'
+        '2025-03-01 10:00:07,web,None\n'
+        '2025-03-01 10:00:08,bot,nan\n'
+        '2025-03-01 10:00:09,bot,NA\n'
+        '2025-03-01 10:00:10,bot,\n'
+        '2025-03-01 10:00:11,bot,Sure - what is the ad ID?\n',
+        encoding='utf-8',
+    )
+    assert ac.csv_to_transcript(str(csv_path)) == (
+        '[2025-03-01 10:00:00] user: I need help with my ad\n'
+        '[2025-03-01 10:00:11] bot: Sure - what is the ad ID?'
+    )
+
+
+class _RateLimiter:
+    def wait_if_needed(self):
+        pass
+
+
+@pytest.fixture
+def completion_server(monkeypatch):
+    """Serve canned chat completion responses; yields a function that sets the next response body and type."""
+    response = {}
+    
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Type', response['content_type'])
+            self.send_header('Content-Length', str(len(response['body'])))
+            self.end_headers()
+            self.wfile.write(response['body'])
+    
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(ac, 'COOPER_BASE_URL', f'http://127.0.0.1:{server.server_port}/v1/chat/completions')
+    
+    def respond(body, content_type):
+        response.update(body=body, content_type=content_type)
+    
+    yield respond
+    server.shutdown()
+
+
+def _sse(chunks, separator):
+    events = [json.dumps({'choices': [{'delta': {'content': c}}]}) for c in chunks] + ['[DONE]']
+    return ''.join(f'data:{separator}{event}\n\n' for event in events).encode()
+
+
+@pytest.mark.parametrize('separator', [' ', ''])
+def test_chat_complete_reads_event_stream(completion_server, separator):
+    completion_server(_sse(['{"solved"', ': true}'], separator), 'text/event-stream; charset=utf-8')
+    assert ac.chat_complete('system', 'user', _RateLimiter()) == '{"solved": true}'
+
+
+def test_chat_complete_reads_plain_json_body(completion_server):
+    body = json.dumps({'choices': [{'message': {'content': '{"solved": false}'}}]}).encode()
+    completion_server(body, 'application/json')
+    assert ac.chat_complete('system', 'user', _RateLimiter()) == '{"solved": false}'
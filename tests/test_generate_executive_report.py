@@ -0,0 +1,36 @@
+"""Regression tests for generate_executive_report (run with `python -m pytest` from the repo root)."""
+
+import pickle
+
+import generate_executive_report as ger
+
+
+def test_executive_summary_without_high_value_conversations():
+    # --dry_run output marks quality 'unknown'; older per_chat files have no quality at all
+    per_chat = [
+        {'file': 'a.csv', 'solved': False, 'conversation_quality': 'unknown', 'user_emotion': 'neutral'},
+        {'file': 'b.csv', 'solved': False, 'conversation_quality': 'low-value'},
+        {'file': 'c.csv', 'solved': True},
+    ]
+    summary = ger.generate_executive_summary({'per_chat': per_chat})
+    assert '**High-Value Conversations**: 0 (0.0%)' in summary
+    assert '0 (0.0% of high-value conversations)' in summary
+
+
+def test_executive_report_without_high_value_conversations(tmp_path):
+    per_chat = [{'file': 'a.csv', 'solved': False, 'conversation_quality': 'unknown'}]
+    output = tmp_path / 'report.md'
+    ger.generate_executive_report(str(tmp_path), str(output), data={'per_chat': per_chat})
+    assert 'Chatbot Performance Executive Summary' in output.read_text(encoding='utf-8')
+
+
+def test_corrupt_report_cache_is_rebuilt(tmp_path):
+    (tmp_path / 'per_chat.jsonl').write_text('{"file": "a.csv", "solved": true}\n', encoding='utf-8')
+    # A pickle that loads fine but is not a (key, records) pair
+    (tmp_path / ger.REPORT_CACHE_NAME).write_bytes(pickle.dumps(42))
+    
+    records = ger.load_report_records(str(tmp_path))
+    
+    assert records == [{'solved': True}]
+    cached_key, cached_records = pickle.loads((tmp_path / ger.REPORT_CACHE_NAME).read_bytes())
+    assert cached_records == records
@@ -0,0 +1,24 @@
+"""Regression tests for summarize_results (run with `python -m pytest` from the repo root)."""
+
+import json
+
+import pytest
+
+import summarize_results as sr
+
+
+@pytest.mark.filterwarnings('error::FutureWarning')
+def test_summary_with_missing_flags(tmp_path):
+    # The second record has neither solved nor needs_human, as in partial or older per_chat files
+    records = [
+        {'file': 'a.csv', 'solved': True, 'needs_human': False, 'topics': ['billing'], 'capabilities': ['refund-help']},
+        {'file': 'b.csv', 'topics': ['ads'], 'why_unsolved': ['bot lacks access']},
+    ]
+    with open(tmp_path / 'per_chat.jsonl', 'w', encoding='utf-8') as f:
+        f.writelines(json.dumps(r) + '\n' for r in records)
+    
+    sr.generate_summary_report(sr.load_analysis_results(str(tmp_path)), str(tmp_path))
+    
+    summary = (tmp_path / 'summary_report.csv').read_text(encoding='utf-8')
+    assert 'Solved Conversations,1' in summary
+    assert 'Needs Human (%),0.0%' in summary